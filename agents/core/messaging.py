@@ -6,9 +6,11 @@ Handles inter-agent communication through a message bus.
 
 import asyncio
 import uuid
+from collections import deque
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional
 
 from config.settings import logger
 
@@ -84,8 +86,8 @@ class MessageBus:
     def __init__(self):
         self.queues: Dict[str, asyncio.Queue] = {}
         self.subscribers: Dict[str, List[Callable]] = {}
-        self.message_history: List[AgentMessage] = []
         self.max_history = 1000
+        self.message_history: Deque[AgentMessage] = deque(maxlen=self.max_history)
 
         logger.info("📨 Message Bus initialized")
 
@@ -96,10 +98,8 @@ class MessageBus:
         Args:
             message: Message to send
         """
-        # Store in history
+        # Store in history (bounded deque drops the oldest entry)
         self.message_history.append(message)
-        if len(self.message_history) > self.max_history:
-            self.message_history.pop(0)
 
         # Handle broadcast messages
         if message.message_type == MessageType.BROADCAST:
@@ -194,14 +194,18 @@ class MessageBus:
         Returns:
             List of message dictionaries
         """
-        messages = self.message_history
-
         if agent_id:
             messages = [
-                m for m in messages if m.sender_id == agent_id or m.recipient_id == agent_id
+                m
+                for m in self.message_history
+                if m.sender_id == agent_id or m.recipient_id == agent_id
             ]
+            return [m.to_dict() for m in messages[-limit:]]
 
-        return [m.to_dict() for m in messages[-limit:]]
+        # Same window as history[-limit:], without copying the deque
+        history = self.message_history
+        start = max(len(history) - limit if limit > 0 else -limit, 0)
+        return [m.to_dict() for m in islice(history, start, None)]
 
     def clear_queue(self, agent_id: str):
         """Clear an agent's message queue"""
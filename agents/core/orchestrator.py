@@ -5,8 +5,9 @@ Coordinates agent activities and task distribution.
 """
 
 import asyncio
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 from config.settings import logger
 
@@ -42,8 +43,8 @@ class AgentOrchestrator:
         self.registry = AgentRegistry()
         self.message_bus = MessageBus()
         self.active_tasks: Dict[str, Dict[str, Any]] = {}
-        self.task_history: List[Dict[str, Any]] = []
         self.max_history = 1000
+        self.task_history: Deque[Dict[str, Any]] = deque(maxlen=self.max_history)
 
         logger.info("🎭 Agent Orchestrator initialized")
 
@@ -153,13 +154,10 @@ class AgentOrchestrator:
     def _move_to_history(self, task_id: str):
         """Move completed task to history"""
         if task_id in self.active_tasks:
+            # Bounded deque drops the oldest entry
             self.task_history.append(self.active_tasks[task_id])
             del self.active_tasks[task_id]
 
-            # Limit history size
-            if len(self.task_history) > self.max_history:
-                self.task_history.pop(0)
-
     async def execute_workflow(
         self, workflow: List[Dict[str, Any]], sequential: bool = True
     ) -> List[Dict[str, Any]]:
@@ -110,6 +110,10 @@ class EnvironmentSettings(BaseSettings):
     ELYZA_TEMPERATURE: float = Field(default=0.7)
     ELYZA_DEVICE: str = Field(default="cpu")  # cpu, cuda, mps
 
+    # Emotion Detection Cache (text results, once a model is loaded)
+    EMOTION_CACHE_MODE: str = Field(default="on")  # on, off, read_only, write_only
+    EMOTION_CACHE_TTL: int = Field(default=3600)  # seconds
+
     # Plugin System Configuration
     # NOTE: Plugin system has isolation and fallback mechanisms
     PLUGINS_ENABLED: bool = Field(default=False)
@@ -390,6 +394,10 @@ class EnhancedLogger:
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
 
+    def isEnabledFor(self, level: int) -> bool:
+        """Check the level first so hot paths can skip building log kwargs"""
+        return self.logger.isEnabledFor(level)
+
     def debug(self, msg: str, **kwargs):
         self.logger.debug(msg, extra={"custom_fields": kwargs})
 
@@ -224,7 +224,7 @@ def init_database():
                     stored_filename TEXT NOT NULL,
                     file_path TEXT NOT NULL,
                     file_size INTEGER NOT NULL,
-                    file_hash TEXT NOT NULL, -- MD5 hash for duplicate detection
+                    file_hash TEXT NOT NULL, -- SHA-256 hash for duplicate detection
                     mime_type TEXT NOT NULL,
                     uploaded_by TEXT NOT NULL,
                     project_id TEXT,
@@ -1,3 +1,4 @@
+import re
 import uuid
 from datetime import datetime
 from enum import Enum
@@ -6,6 +7,11 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, validator
 
+# Validation patterns, compiled once for all validator calls
+_MESSAGE_USERNAME_RE = re.compile(r"^[a-zA-Z0-9_\- .@]+$")
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_USERNAME_RE = re.compile(r"^[a-zA-Z0-9_]+$")
+
 
 class MessageType(str, Enum):
     """Types of messages in the chat system"""
@@ -154,9 +160,7 @@ class Message(BaseDatabaseModel):
     @validator("username")
     def validate_username(cls, v):
         """Validate username format"""
-        import re
-
-        if not re.match(r"^[a-zA-Z0-9_\- .@]+$", v):
+        if not _MESSAGE_USERNAME_RE.match(v):
             raise ValueError("Username contains invalid characters")
         return v.strip()
 
@@ -285,18 +289,14 @@ class User(BaseDatabaseModel):
     @validator("email")
     def validate_email(cls, v):
         """Validate email format"""
-        import re
-
-        if not re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", v):
+        if not _EMAIL_RE.match(v):
             raise ValueError("Invalid email format")
         return v.lower()
 
     @validator("username")
     def validate_username_format(cls, v):
         """Validate username format"""
-        import re
-
-        if not re.match(r"^[a-zA-Z0-9_]+$", v):
+        if not _USERNAME_RE.match(v):
             raise ValueError("Username can only contain letters, numbers and underscores")
         return v
 
@@ -454,7 +454,7 @@ class File(BaseDatabaseModel):
     stored_filename: str = Field(..., description="Stored filename on server")
     file_path: str = Field(..., description="Full file path")
     file_size: int = Field(..., ge=0, description="File size in bytes")
-    file_hash: str = Field(..., description="MD5 file hash for deduplication")
+    file_hash: str = Field(..., description="SHA-256 file hash for deduplication")
     mime_type: str = Field(..., description="File MIME type")
     file_type: FileType = Field(..., description="File type category")
 
@@ -150,6 +150,25 @@ class MessageRepository:
             logger.error(f"❌ Failed to retrieve recent messages: {e}")
             return []
 
+    @staticmethod
+    def get_messages_by_username(username: str, limit: int = 50) -> List[Message]:
+        """Retrieve a user's newest messages (uses idx_messages_username)"""
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.execute(
+                    """SELECT id, username, message, message_compressed, timestamp, message_type,
+                              parent_id, room_id, project_id, ticket_id, is_ai_response, ai_model_used,
+                              context_message_ids, rag_sources, sentiment, is_edited, edit_history,
+                              reaction_count, flags, metadata
+                       FROM messages WHERE username = ? ORDER BY timestamp DESC LIMIT ?""",
+                    (username, limit),
+                )
+                return [MessageRepository._row_to_message(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"❌ Failed to retrieve messages for user {username}: {e}")
+            return []
+
     @staticmethod
     def get_messages_by_filter(filters: MessageFilter) -> PaginatedResponse:
         """Retrieve messages using comprehensive filter criteria"""
@@ -791,16 +810,34 @@ class FileRepository:
             return None
 
     @staticmethod
-    def increment_download_count(file_id: str):
-        """Increment file download count"""
+    def get_files_by_project(project_id: str) -> List[File]:
+        """Get all files attached to a project (uses idx_files_project)"""
         try:
             with get_db_connection() as conn:
-                conn.execute(
+                cursor = conn.execute(
+                    "SELECT * FROM files WHERE project_id = ? ORDER BY upload_date DESC",
+                    (project_id,),
+                )
+                return [FileRepository._row_to_file(row) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"❌ Failed to get files for project {project_id}: {e}")
+            return []
+
+    @staticmethod
+    def increment_download_count(file_id: str) -> bool:
+        """Increment file download count; False if the file is unknown or the update failed"""
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.execute(
                     "UPDATE files SET download_count = download_count + 1 WHERE id = ?", (file_id,)
                 )
+                if cursor.rowcount == 0:
+                    return False
                 logger.debug(f"📥 Incremented download count for file {file_id}")
+                return True
         except Exception as e:
             logger.error(f"❌ Failed to increment download count for file {file_id}: {e}")
+            return False
 
     @staticmethod
     def _row_to_file(row) -> File:
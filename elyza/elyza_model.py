@@ -16,6 +16,7 @@ import os
 from typing import Any, Dict, List, Optional
 
 from config.settings import logger
+from utils.env_utils import parse_bool_env
 
 
 class ELYZAModel:
@@ -56,13 +57,13 @@ class ELYZAModel:
             self._rag_enabled = settings.RAG_ENABLED
         except Exception:
             # Fallback to environment variables if config import fails
-            self.enabled = os.getenv("ELYZA_ENABLED", "false").lower() == "true"
+            self.enabled = parse_bool_env("ELYZA_ENABLED")
             self.model_path = os.getenv("ELYZA_MODEL_PATH", "./models/elyza")
-            self.use_gpu = os.getenv("ELYZA_USE_GPU", "false").lower() == "true"
+            self.use_gpu = parse_bool_env("ELYZA_USE_GPU")
             self.max_length = int(os.getenv("ELYZA_MAX_LENGTH", "512"))
             self.temperature = float(os.getenv("ELYZA_TEMPERATURE", "0.7"))
             self.device = os.getenv("ELYZA_DEVICE", "cpu")
-            self._rag_enabled = os.getenv("RAG_ENABLED", "false").lower() == "true"
+            self._rag_enabled = parse_bool_env("RAG_ENABLED")
 
         self.model_loaded = False
         self.fallback_active = False
@@ -71,7 +72,15 @@ class ELYZAModel:
         self._elyza_service = None
 
         # Internet capabilities
-        self._internet_enabled = os.getenv("ELYZA_INTERNET_SEARCH", "false").lower() == "true"
+        self._internet_enabled = parse_bool_env("ELYZA_INTERNET_SEARCH")
+
+        # Fixed after init; each generate() response gets its own copy
+        self._evolution_info = {
+            "classical_available": True,
+            "text_analysis_available": True,
+            "rag_available": self._rag_enabled,
+            "internet_available": self._internet_enabled,
+        }
 
         if self.enabled:
             self._initialize_model()
@@ -179,12 +188,7 @@ class ELYZAModel:
                 "temperature": temperature,
                 "metadata": {
                     **result.get("metadata", {}),
-                    "evolution_info": {
-                        "classical_available": True,
-                        "text_analysis_available": True,
-                        "rag_available": self._rag_enabled,
-                        "internet_available": self._internet_enabled,
-                    },
+                    "evolution_info": dict(self._evolution_info),
                     "service_stats": self._elyza_service.get_stats(),
                 },
                 "status": "success",
@@ -30,6 +30,8 @@ from routes.search import router as search_router
 from routes.settings import router as settings_router
 from routes.threads import router as threads_router
 from routes.users import router as users_router
+from services.emotion_detection import get_emotion_service
+from services.message_service import close_async_http_client
 
 
 @asynccontextmanager
@@ -65,6 +67,9 @@ async def lifespan(app: FastAPI):
             version=db_health.get("version", "unknown"),
         )
 
+        # Load models up front so the first request doesn't pay for it
+        await get_emotion_service().warmup()
+
         # Log system configuration
         enhanced_logger.info(
             "System configuration",
@@ -102,6 +107,7 @@ async def lifespan(app: FastAPI):
     try:
         # Perform cleanup tasks
         enhanced_logger.info("Performing cleanup tasks")
+        await close_async_http_client()
 
         # Log final statistics
         db_stats = get_database_stats()
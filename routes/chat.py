@@ -298,7 +298,7 @@ async def ask_ai_question(
 
         logger.info(f"🤖 AI question from {username} in project {project_id}: '{question[:50]}...'")
 
-        result = message_service.ask_question(
+        result = await message_service.ask_question(
             question=question,
             username=username,
             use_context=use_context,
@@ -609,7 +609,7 @@ async def upload_file(
 async def get_file_info(file_id: str):
     """Get file information"""
     try:
-        file_record = file_repository.get_file(file_id)
+        file_record = file_service.get_file(file_id)
 
         if not file_record:
             raise HTTPException(status_code=404, detail="File not found")
@@ -629,7 +629,7 @@ async def get_file_info(file_id: str):
 async def download_file(file_id: str):
     """Download a file"""
     try:
-        file_record = file_repository.get_file(file_id)
+        file_record = file_service.get_file(file_id)
 
         if not file_record:
             raise HTTPException(status_code=404, detail="File not found")
@@ -638,7 +638,7 @@ async def download_file(file_id: str):
             raise HTTPException(status_code=404, detail="File not found on server")
 
         # Increment download count
-        file_repository.increment_download_count(file_id)
+        file_service.increment_download_count(file_id)
 
         logger.info(f"📥 File download: {file_record.original_filename}")
 
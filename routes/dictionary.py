@@ -44,7 +44,7 @@ async def add_term(
     safe_examples = examples if examples is not None else []
     safe_synonyms = synonyms if synonyms is not None else []
     safe_related_terms = related_terms if related_terms is not None else []
-    return await dictionary_service.add_term(
+    return dictionary_service.add_term(
         term, definition, safe_category, safe_examples, safe_synonyms, safe_related_terms, language
     )
 
@@ -55,10 +55,10 @@ async def list_terms(category: Optional[str] = None, limit: int = 50) -> Dict[st
     dictionary_service = get_dictionary_service()
 
     if category:
-        terms = await dictionary_service.get_terms_by_category(category, limit)
+        terms = dictionary_service.get_terms_by_category(category, limit)
     else:
         # Get all terms (limited)
-        terms = list(dictionary_service.terms.values())[:limit]
+        terms = [entry.to_dict() for entry in list(dictionary_service.terms.values())[:limit]]
 
     return {"items": terms, "total": len(terms)}
 
@@ -70,14 +70,14 @@ async def get_term(term_id: str) -> Dict[str, Any]:
     term = dictionary_service.terms.get(term_id)
     if not term:
         raise HTTPException(status_code=404, detail="Term not found")
-    return term
+    return term.to_dict()
 
 
 @router.get("/lookup/{term}")
 async def lookup_term(term: str) -> Dict[str, Any]:
     """Look up a term by name"""
     dictionary_service = get_dictionary_service()
-    result = await dictionary_service.lookup(term)
+    result = dictionary_service.lookup(term)
     if not result:
         raise HTTPException(status_code=404, detail="Term not found")
     return result
@@ -87,14 +87,14 @@ async def lookup_term(term: str) -> Dict[str, Any]:
 async def update_term(term_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
     """Update a dictionary term"""
     dictionary_service = get_dictionary_service()
-    return await dictionary_service.update_term(term_id, updates)
+    return dictionary_service.update_term(term_id, updates)
 
 
 @router.delete("/terms/{term_id}")
 async def delete_term(term_id: str) -> Dict[str, Any]:
     """Delete a dictionary term"""
     dictionary_service = get_dictionary_service()
-    success = await dictionary_service.delete_term(term_id)
+    success = dictionary_service.delete_term(term_id)
     return {"deleted": success, "term_id": term_id}
 
 
@@ -102,7 +102,7 @@ async def delete_term(term_id: str) -> Dict[str, Any]:
 async def suggest_terms(partial: str, limit: int = 10) -> List[str]:
     """Get term suggestions for autocomplete"""
     dictionary_service = get_dictionary_service()
-    return await dictionary_service.suggest(partial, limit)
+    return dictionary_service.suggest(partial, limit)
 
 
 @router.get("/search")
@@ -113,7 +113,7 @@ async def search_terms(
     dictionary_service = get_dictionary_service()
     safe_category = category if category is not None else ""
     safe_language = language if language is not None else ""
-    results = await dictionary_service.search_terms(query, safe_category, safe_language, limit)
+    results = dictionary_service.search_terms(query, safe_category, safe_language, limit)
     return {"query": query, "results": results, "total": len(results)}
 
 
@@ -121,18 +121,18 @@ async def search_terms(
 async def get_related_terms(term_id: str) -> List[Dict[str, Any]]:
     """Get related terms"""
     dictionary_service = get_dictionary_service()
-    return await dictionary_service.get_related_terms(term_id)
+    return dictionary_service.get_related_terms(term_id)
 
 
 @router.get("/categories")
 async def get_categories() -> List[str]:
     """Get all dictionary categories"""
     dictionary_service = get_dictionary_service()
-    return await dictionary_service.get_all_categories()
+    return dictionary_service.get_all_categories()
 
 
 @router.get("/statistics")
 async def get_statistics() -> Dict[str, Any]:
     """Get dictionary statistics"""
     dictionary_service = get_dictionary_service()
-    return await dictionary_service.get_statistics()
+    return dictionary_service.get_statistics()
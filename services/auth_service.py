@@ -4,11 +4,17 @@ Authentication Service
 Handles user authentication, JWT tokens, and authorization
 """
 
+import base64
 import hashlib
-import secrets
+import hmac
+import logging
+import os
+import re
+import threading
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
 from config.settings import enhanced_logger, settings
 
@@ -35,6 +41,52 @@ except ImportError:
     # Fallback to base Exception if jose is not available
     AuthJWTError = Exception
 
+# Fast JSON for simple-token payloads (orjson returns bytes directly)
+_jdumps: Callable[[Any], bytes]
+_jloads: Callable[[Union[str, bytes]], Any]
+try:
+    import orjson
+
+    _jdumps = orjson.dumps
+    _jloads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _jdumps = _json_bytes
+    _jloads = json.loads
+
+# Alphabet of urlsafe base64 tokens; lets malformed input fail without an exception
+_B64URL_RE = re.compile(r"[A-Za-z0-9_\-]+={0,2}")
+
+
+class _RandPool:
+    """
+    Buffered source of random bytes.
+
+    Refills from os.urandom in large blocks so bulk key issuance does not pay
+    one syscall per token. os.urandom is the same CSPRNG that backs `secrets`.
+    """
+
+    def __init__(self, size: int = 4096):
+        self._buf = b""
+        self._size = size
+        self._lock = threading.Lock()
+
+    def take(self, n: int) -> bytes:
+        """Return n fresh random bytes; bytes are never handed out twice"""
+        with self._lock:
+            if len(self._buf) < n:
+                self._buf = os.urandom(max(self._size, n))
+            out, self._buf = self._buf[:n], self._buf[n:]
+        return out
+
+    def token_urlsafe(self, nbytes: int = 32) -> str:
+        """Drop-in equivalent of secrets.token_urlsafe backed by the pool"""
+        return base64.urlsafe_b64encode(self.take(nbytes)).rstrip(b"=").decode("ascii")
+
 
 class AuthService:
     """
@@ -44,9 +96,11 @@ class AuthService:
 
     def __init__(self):
         self.secret_key = settings.APP_SECRET_KEY
+        self._secret_bytes = self.secret_key.encode("utf-8")
         self.algorithm = "HS256"
         self.access_token_expire_minutes = 60
         self.refresh_token_expire_days = 7
+        self.max_sessions = 100_000
 
         # Initialize password hashing
         if PASSLIB_AVAILABLE and CryptContext is not None:
@@ -64,8 +118,15 @@ class AuthService:
         # API keys storage (in production, use database)
         self._api_keys: Dict[str, Dict[str, Any]] = {}
 
-        # Session storage
-        self._sessions: Dict[str, Dict[str, Any]] = {}
+        # Session storage, kept in least-recently-active order and capped at
+        # max_sessions (oldest sessions are evicted on insert)
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        # Keyed HMAC for simple tokens; copied per use to skip re-keying SHA-256
+        self._hmac_template = hmac.new(self._secret_bytes, digestmod=hashlib.sha256)
+
+        # Random byte pool for API keys and fallback refresh tokens
+        self._randpool = _RandPool()
 
         enhanced_logger.info(
             "AuthService initialized",
@@ -133,7 +194,7 @@ class AuthService:
     def create_refresh_token(self, user_id: str) -> str:
         """Create a refresh token"""
         if not JOSE_AVAILABLE or jwt is None:
-            return secrets.token_urlsafe(32)
+            return self._randpool.token_urlsafe(32)
 
         expire = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
 
@@ -165,9 +226,6 @@ class AuthService:
 
     def _create_simple_token(self, user_id: str, username: str, role: str) -> str:
         """Create a simple token when JWT is not available"""
-        import base64
-        import json
-
         token_data = {
             "sub": user_id,
             "username": username,
@@ -177,28 +235,30 @@ class AuthService:
             ).isoformat(),
         }
 
-        data_str = json.dumps(token_data)
-        signature = hashlib.sha256(f"{data_str}{self.secret_key}".encode()).hexdigest()[:16]
+        data_bytes = _jdumps(token_data)
+        signature = self._sign_simple_token(data_bytes)
 
-        return base64.urlsafe_b64encode(f"{data_str}|{signature}".encode()).decode()
+        return base64.urlsafe_b64encode(data_bytes + b"|" + signature).decode()
+
+    def _sign_simple_token(self, data_bytes: bytes) -> bytes:
+        """Truncated hex HMAC-SHA256 signature of a simple-token payload"""
+        h = self._hmac_template.copy()
+        h.update(data_bytes)
+        return h.hexdigest()[:16].encode()
 
     def _verify_simple_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify a simple token"""
-        import base64
-        import json
+        if not isinstance(token, str) or not _B64URL_RE.fullmatch(token):
+            return None
 
         try:
-            decoded = base64.urlsafe_b64decode(token).decode()
-            data_str, signature = decoded.rsplit("|", 1)
-
-            expected_signature = hashlib.sha256(
-                f"{data_str}{self.secret_key}".encode()
-            ).hexdigest()[:16]
+            decoded = base64.urlsafe_b64decode(token)
+            data_bytes, signature = decoded.rsplit(b"|", 1)
 
-            if signature != expected_signature:
+            if not hmac.compare_digest(signature, self._sign_simple_token(data_bytes)):
                 return None
 
-            payload = json.loads(data_str)
+            payload = _jloads(data_bytes)
 
             # Check expiration
             exp = datetime.fromisoformat(payload["exp"])
@@ -214,7 +274,7 @@ class AuthService:
         self, user_id: str, name: str, permissions: Optional[List[str]] = None
     ) -> Dict[str, str]:
         """Create an API key for a user"""
-        api_key = f"sk_{secrets.token_urlsafe(32)}"
+        api_key = f"sk_{self._randpool.token_urlsafe(32)}"
         key_id = str(uuid.uuid4())
 
         self._api_keys[api_key] = {
@@ -227,7 +287,8 @@ class AuthService:
             "active": True,
         }
 
-        enhanced_logger.info("API key created", key_id=key_id, user_id=user_id, name=name)
+        if enhanced_logger.isEnabledFor(logging.INFO):
+            enhanced_logger.info("API key created", key_id=key_id, user_id=user_id, name=name)
 
         return {"id": key_id, "api_key": api_key, "name": name}
 
@@ -250,7 +311,8 @@ class AuthService:
         """Revoke an API key"""
         if api_key in self._api_keys:
             self._api_keys[api_key]["active"] = False
-            enhanced_logger.info("API key revoked", key_id=self._api_keys[api_key]["id"])
+            if enhanced_logger.isEnabledFor(logging.INFO):
+                enhanced_logger.info("API key revoked", key_id=self._api_keys[api_key]["id"])
             return True
         return False
 
@@ -268,17 +330,22 @@ class AuthService:
     ) -> str:
         """Create a user session"""
         session_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+
+        while len(self._sessions) >= self.max_sessions:
+            self._sessions.popitem(last=False)
 
         self._sessions[session_id] = {
             "user_id": user_id,
             "username": username,
-            "created_at": datetime.now().isoformat(),
-            "last_activity": datetime.now().isoformat(),
+            "created_at": now,
+            "last_activity": now,
             "metadata": metadata or {},
             "active": True,
         }
 
-        enhanced_logger.debug("Session created", session_id=session_id, user_id=user_id)
+        if enhanced_logger.isEnabledFor(logging.DEBUG):
+            enhanced_logger.debug("Session created", session_id=session_id, user_id=user_id)
 
         return session_id
 
@@ -287,8 +354,9 @@ class AuthService:
         session = self._sessions.get(session_id)
 
         if session and session.get("active", True):
-            # Update last activity
-            self._sessions[session_id]["last_activity"] = datetime.now().isoformat()
+            # Update last activity and keep LRU order
+            session["last_activity"] = datetime.now().isoformat()
+            self._sessions.move_to_end(session_id)
             return session
 
         return None
@@ -297,7 +365,8 @@ class AuthService:
         """Invalidate a session"""
         if session_id in self._sessions:
             self._sessions[session_id]["active"] = False
-            enhanced_logger.debug("Session invalidated", session_id=session_id)
+            if enhanced_logger.isEnabledFor(logging.DEBUG):
+                enhanced_logger.debug("Session invalidated", session_id=session_id)
             return True
         return False
 
@@ -306,13 +375,11 @@ class AuthService:
         cutoff = datetime.now() - timedelta(hours=max_age_hours)
         removed = 0
 
-        expired_sessions = []
-        for session_id, data in self._sessions.items():
-            last_activity = datetime.fromisoformat(data["last_activity"])
-            if last_activity < cutoff:
-                expired_sessions.append(session_id)
-
-        for session_id in expired_sessions:
+        # Sessions are ordered by last activity, so stop at the first fresh one
+        while self._sessions:
+            session_id, data = next(iter(self._sessions.items()))
+            if datetime.fromisoformat(data["last_activity"]) >= cutoff:
+                break
             del self._sessions[session_id]
             removed += 1
 
@@ -6,7 +6,7 @@ Handles AI-powered avatars and virtual presence features.
 This is a placeholder for the planned avatar system.
 """
 
-from datetime import datetime
+import uuid
 from typing import Any, Dict, List, Optional
 
 from config.settings import logger
@@ -39,7 +39,7 @@ class AvatarService:
         Returns:
             Dict mit Avatar-Informationen
         """
-        avatar_id = f"avatar_{user_id}_{datetime.now().timestamp()}"
+        avatar_id = f"avatar_{user_id}_{uuid.uuid4().hex[:12]}"
         return {
             "avatar_id": avatar_id,
             "status": "created",
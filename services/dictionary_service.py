@@ -6,12 +6,116 @@ Manages terminology and glossary functionality.
 This is a placeholder for the planned dictionary system.
 """
 
+import sys
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import count, islice
+from typing import Any, DefaultDict, Dict, Iterator, List, Optional, Tuple
 
 from config.settings import logger
 
 
+@dataclass
+class TermEntry:
+    """Dictionary term; stored with __slots__ and converted to a dict at the API boundary"""
+
+    __slots__ = (
+        "id",
+        "term",
+        "term_lower",
+        "definition",
+        "definition_lower",
+        "category",
+        "examples",
+        "synonyms",
+        "related_terms",
+        "language",
+        "created_at",
+        "updated_at",
+    )
+
+    id: str
+    term: str
+    term_lower: str
+    definition: str
+    definition_lower: str
+    category: Optional[str]
+    examples: List[str]
+    synonyms: List[str]
+    related_terms: List[str]
+    language: str
+    created_at: str
+    updated_at: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "term": self.term,
+            "term_lower": self.term_lower,
+            "definition": self.definition,
+            "category": self.category,
+            "examples": self.examples,
+            "synonyms": self.synonyms,
+            "related_terms": self.related_terms,
+            "language": self.language,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "status": "created",
+            "message": "Dictionary Service not yet implemented - term stored in memory only",
+        }
+
+
+# Fields update_term may overwrite; the *_lower fields are derived
+_UPDATABLE_FIELDS = frozenset(TermEntry.__slots__) - {
+    "id",
+    "term_lower",
+    "definition_lower",
+    "created_at",
+}
+
+
+class _PrefixIndex:
+    """
+    Sorted (key, display) pairs for autocomplete.
+
+    Lowercased keys are kept sorted so a prefix query is one binary search
+    followed by a contiguous scan; duplicate pairs are reference counted.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[str, str]] = []
+        self._refcounts: Dict[Tuple[str, str], int] = {}
+
+    def insert(self, key: str, display: str) -> None:
+        pair = (key, display)
+        if pair in self._refcounts:
+            self._refcounts[pair] += 1
+            return
+        self._refcounts[pair] = 1
+        insort(self._entries, pair)
+
+    def remove(self, key: str, display: str) -> None:
+        pair = (key, display)
+        refcount = self._refcounts.get(pair)
+        if refcount is None:
+            return
+        if refcount > 1:
+            self._refcounts[pair] = refcount - 1
+            return
+        del self._refcounts[pair]
+        del self._entries[bisect_left(self._entries, pair)]
+
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        entries = self._entries
+        for index in range(bisect_left(entries, (prefix,)), len(entries)):
+            key, display = entries[index]
+            if not key.startswith(prefix):
+                return
+            yield display
+
+
 class DictionaryService:
     """
     Wörterbuch-/Glossar-System
@@ -25,12 +129,30 @@ class DictionaryService:
     """
 
     def __init__(self):
-        self.terms: Dict[str, Dict[str, Any]] = {}
-        self.categories: Dict[str, List[str]] = {}
-        self.synonyms: Dict[str, List[str]] = {}
+        self.terms: Dict[str, TermEntry] = {}
+        # Lowercased term -> term_ids in the order they were indexed (first wins)
+        self.terms_by_lower: DefaultDict[str, List[str]] = defaultdict(list)
+        self.categories: DefaultDict[str, List[str]] = defaultdict(list)
+        self.synonyms: DefaultDict[str, List[str]] = defaultdict(list)
+        # term_id -> (index kind, key) pairs it was added under, for O(k) removal
+        self._term_to_indexes: Dict[str, List[Tuple[str, str]]] = {}
+        self._id_counter = count(1)
+        # Prefix index over terms (original casing) and synonym keys for suggest()
+        self._suggest_index = _PrefixIndex()
+        # Lowercased "term<NUL>definition<SOH>" blob for search_terms. New terms
+        # are appended; updates and deletes mark it dirty for a full rebuild.
+        self._corpus_chunks: List[str] = []
+        self._corpus_lower: Optional[str] = None
+        self._corpus_length = 0
+        self._corpus_starts: List[int] = []
+        self._corpus_entries: List[TermEntry] = []
+        self._corpus_dirty = False
+        # get_statistics() result, recomputed only after mutations
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_dirty = True
         logger.info("📖 Dictionary Service initialized (placeholder)")
 
-    async def add_term(
+    def add_term(
         self,
         term: str,
         definition: str,
@@ -55,43 +177,39 @@ class DictionaryService:
         Returns:
             Dict mit Begriff-Informationen
         """
-        term_id = f"term_{term.lower().replace(' ', '_')}_{datetime.now().timestamp()}"
+        now_iso = datetime.now().isoformat()
         term_lower = term.lower()
-
-        term_entry = {
-            "id": term_id,
-            "term": term,
-            "term_lower": term_lower,
-            "definition": definition,
-            "category": category,
-            "examples": examples or [],
-            "synonyms": synonyms or [],
-            "related_terms": related_terms or [],
-            "language": language,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "status": "created",
-            "message": "Dictionary Service not yet implemented - term stored in memory only",
-        }
+        # Categories and languages come from a small vocabulary; share one object each
+        category = sys.intern(category) if category else category
+        language = sys.intern(language)
+        term_id = f"term_{term_lower.replace(' ', '_')}_{next(self._id_counter)}"
+
+        term_entry = TermEntry(
+            id=term_id,
+            term=term,
+            term_lower=term_lower,
+            definition=definition,
+            definition_lower=definition.lower(),
+            category=category,
+            examples=examples or [],
+            synonyms=synonyms or [],
+            related_terms=related_terms or [],
+            language=language,
+            created_at=now_iso,
+            updated_at=now_iso,
+        )
 
         self.terms[term_id] = term_entry
+        self.terms_by_lower[term_lower].append(term_id)
+        self._suggest_index.insert(term_lower, term)
+        if not self._corpus_dirty:
+            self._append_to_corpus(term_entry)
 
-        # Index by category
-        if category:
-            if category not in self.categories:
-                self.categories[category] = []
-            self.categories[category].append(term_id)
+        self._index_relations(term_entry)
 
-        # Index synonyms
-        if synonyms:
-            for synonym in synonyms:
-                if synonym.lower() not in self.synonyms:
-                    self.synonyms[synonym.lower()] = []
-                self.synonyms[synonym.lower()].append(term_id)
+        return term_entry.to_dict()
 
-        return term_entry
-
-    async def lookup(self, term: str) -> Optional[Dict[str, Any]]:
+    def lookup(self, term: str) -> Optional[Dict[str, Any]]:
         """
         Sucht Begriff nach
 
@@ -104,19 +222,19 @@ class DictionaryService:
         term_lower = term.lower()
 
         # Direct lookup
-        for entry in self.terms.values():
-            if entry.get("term_lower") == term_lower:
-                return entry
+        term_ids = self.terms_by_lower.get(term_lower)
+        if term_ids:
+            return self.terms[term_ids[0]].to_dict()
 
         # Synonym lookup
         if term_lower in self.synonyms:
             term_ids = self.synonyms[term_lower]
-            if term_ids:
-                return self.terms.get(term_ids[0])
+            if term_ids and term_ids[0] in self.terms:
+                return self.terms[term_ids[0]].to_dict()
 
         return None
 
-    async def suggest(self, partial_term: str, limit: int = 10) -> List[str]:
+    def suggest(self, partial_term: str, limit: int = 10) -> List[str]:
         """
         Auto-Vervollständigung für Begriffe
 
@@ -127,55 +245,115 @@ class DictionaryService:
         Returns:
             Liste mit Vorschlägen
         """
-        suggestions = []
+        suggestions: List[str] = []
+        seen = set()
         partial_lower = partial_term.lower()
 
-        for entry in self.terms.values():
-            term = entry.get("term", "")
-            if term.lower().startswith(partial_lower):
-                suggestions.append(term)
-                if len(suggestions) >= limit:
-                    break
-
-        # Also check synonyms
-        for synonym in self.synonyms.keys():
-            if synonym.startswith(partial_lower) and synonym not in suggestions:
-                suggestions.append(synonym)
-                if len(suggestions) >= limit:
-                    break
-
-        return suggestions[:limit]
-
-    async def update_term(self, term_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        # Terms and synonyms share one sorted index
+        for suggestion in self._suggest_index.iter_prefix(partial_lower):
+            if len(suggestions) >= limit:
+                break
+            if suggestion not in seen:
+                seen.add(suggestion)
+                suggestions.append(suggestion)
+
+        return suggestions
+
+    def update_term(self, term_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Aktualisiert einen Begriff"""
         if term_id not in self.terms:
             return {"error": "Term not found", "term_id": term_id}
 
         entry = self.terms[term_id]
+        old_term = entry.term
+        old_definition = entry.definition
 
         for key, value in updates.items():
-            if key in entry and key not in ["id", "created_at"]:
-                entry[key] = value
-
-        entry["updated_at"] = datetime.now().isoformat()
-        return entry
-
-    async def delete_term(self, term_id: str) -> bool:
+            if key in _UPDATABLE_FIELDS:
+                if key in ("category", "language") and isinstance(value, str):
+                    value = sys.intern(value)
+                setattr(entry, key, value)
+
+        if entry.term != old_term:
+            self._suggest_index.remove(entry.term_lower, old_term)
+            self._unindex_term_lower(entry.term_lower, term_id)
+            entry.term_lower = entry.term.lower()
+            self.terms_by_lower[entry.term_lower].append(term_id)
+            self._suggest_index.insert(entry.term_lower, entry.term)
+
+        if "category" in updates or "synonyms" in updates:
+            self._unindex_relations(term_id)
+            self._index_relations(entry)
+
+        if entry.definition != old_definition:
+            entry.definition_lower = entry.definition.lower()
+
+        entry.updated_at = datetime.now().isoformat()
+        self._corpus_dirty = True
+        return entry.to_dict()
+
+    def delete_term(self, term_id: str) -> bool:
         """Löscht einen Begriff"""
         if term_id in self.terms:
-            del self.terms[term_id]
+            entry = self.terms.pop(term_id)
+            self._unindex_term_lower(entry.term_lower, term_id)
+            self._suggest_index.remove(entry.term_lower, entry.term)
+            self._unindex_relations(term_id)
+            self._corpus_dirty = True
             return True
         return False
 
-    async def get_terms_by_category(self, category: str, limit: int = 50) -> List[Dict[str, Any]]:
+    def _index_relations(self, entry: TermEntry) -> None:
+        """Add a term to the category and synonym indexes"""
+        keys: List[Tuple[str, str]] = []
+
+        if entry.category:
+            self.categories[entry.category].append(entry.id)
+            keys.append(("category", entry.category))
+
+        # Lowercase each synonym once and skip case-variant duplicates
+        for key in dict.fromkeys(sys.intern(synonym.lower()) for synonym in entry.synonyms):
+            self.synonyms[key].append(entry.id)
+            self._suggest_index.insert(key, key)
+            keys.append(("synonym", key))
+
+        self._term_to_indexes[entry.id] = keys
+        self._stats_dirty = True
+
+    def _unindex_relations(self, term_id: str) -> None:
+        """Remove a term from every index it was recorded under"""
+        self._stats_dirty = True
+        for kind, key in self._term_to_indexes.pop(term_id, []):
+            index = self.categories if kind == "category" else self.synonyms
+            term_ids = index.get(key)
+            if term_ids is None:
+                continue
+            if term_id in term_ids:
+                term_ids.remove(term_id)
+            if not term_ids:
+                del index[key]
+            if kind == "synonym":
+                self._suggest_index.remove(key, key)
+
+    def _unindex_term_lower(self, term_lower: str, term_id: str) -> None:
+        """Drop term_id from the lowercase index; a duplicate spelling takes over"""
+        term_ids = self.terms_by_lower.get(term_lower)
+        if term_ids is None:
+            return
+        if term_id in term_ids:
+            term_ids.remove(term_id)
+        if not term_ids:
+            del self.terms_by_lower[term_lower]
+
+    def get_terms_by_category(self, category: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Gibt alle Begriffe einer Kategorie zurück"""
         if category not in self.categories:
             return []
 
-        term_ids = self.categories[category][:limit]
-        return [self.terms[tid] for tid in term_ids if tid in self.terms]
+        term_ids = islice(self.categories[category], max(limit, 0))
+        return [self.terms[tid].to_dict() for tid in term_ids]
 
-    async def search_terms(
+    def search_terms(
         self,
         query: str,
         category: Optional[str] = None,
@@ -194,65 +372,108 @@ class DictionaryService:
         Returns:
             Liste mit passenden Begriffen
         """
-        results = []
-        query_lower = query.lower()
+        matches = self._iter_search(query.lower(), category, language)
+        return [entry.to_dict() for entry in islice(matches, max(limit, 0))]
+
+    def _iter_search(
+        self, query_lower: str, category: Optional[str], language: Optional[str]
+    ) -> Iterator[TermEntry]:
+        """Lazily yield matching terms: the exact match first, then corpus hits"""
+
+        # Exact term match is ranked first and answered without scanning
+        exact_ids = self.terms_by_lower.get(query_lower)
+        exact = self.terms[exact_ids[0]] if exact_ids else None
+        if (
+            exact is not None
+            and (not category or exact.category == category)
+            and (not language or exact.language == language)
+        ):
+            yield exact
+
+        if self._corpus_dirty:
+            self._rebuild_corpus()
+        if self._corpus_lower is None:
+            self._corpus_lower = "".join(self._corpus_chunks)
+
+        corpus = self._corpus_lower
+        starts = self._corpus_starts
+        entries = self._corpus_entries
+        if not starts:
+            return
+
+        # One str.find sweep over all terms; each hit is mapped back to its entry
+        # and the scan resumes at the next entry so every term matches once
+        pos = corpus.find(query_lower)
+        while pos != -1:
+            index = bisect_right(starts, pos) - 1
+            entry = entries[index]
 
-        for entry in self.terms.values():
-            # Check if query matches term or definition
             if (
-                query_lower in entry.get("term", "").lower()
-                or query_lower in entry.get("definition", "").lower()
+                entry is not exact
+                and (not category or entry.category == category)
+                and (not language or entry.language == language)
             ):
+                yield entry
+
+            if index + 1 >= len(starts):
+                return
+            pos = corpus.find(query_lower, starts[index + 1])
+
+    def _append_to_corpus(self, entry: TermEntry) -> None:
+        """Append one term to the search corpus; the blob is re-joined lazily"""
+        chunk = f"{entry.term_lower}\x00{entry.definition_lower}\x01"
+        self._corpus_chunks.append(chunk)
+        self._corpus_starts.append(self._corpus_length)
+        self._corpus_entries.append(entry)
+        self._corpus_length += len(chunk)
+        self._corpus_lower = None
+
+    def _rebuild_corpus(self) -> None:
+        """Regenerate the search corpus from all terms"""
+        self._corpus_chunks = []
+        self._corpus_starts = []
+        self._corpus_entries = []
+        self._corpus_length = 0
+        for entry in self.terms.values():
+            self._append_to_corpus(entry)
+        self._corpus_dirty = False
 
-                # Filter by category
-                if category and entry.get("category") != category:
-                    continue
-
-                # Filter by language
-                if language and entry.get("language") != language:
-                    continue
-
-                results.append(entry)
-
-                if len(results) >= limit:
-                    break
-
-        return results
-
-    async def get_related_terms(self, term_id: str) -> List[Dict[str, Any]]:
+    def get_related_terms(self, term_id: str) -> List[Dict[str, Any]]:
         """Gibt verwandte Begriffe zurück"""
         if term_id not in self.terms:
             return []
 
         entry = self.terms[term_id]
-        related_ids = entry.get("related_terms", [])
 
         results = []
-        for related in related_ids:
+        for related in entry.related_terms:
             # Try to find by ID or term name
             if related in self.terms:
-                results.append(self.terms[related])
+                results.append(self.terms[related].to_dict())
             else:
                 # Search by term name
-                found = await self.lookup(related)
+                found = self.lookup(related)
                 if found:
                     results.append(found)
 
         return results
 
-    async def get_all_categories(self) -> List[str]:
+    def get_all_categories(self) -> List[str]:
         """Gibt alle Kategorien zurück"""
         return list(self.categories.keys())
 
-    async def get_statistics(self) -> Dict[str, Any]:
+    def get_statistics(self) -> Dict[str, Any]:
         """Gibt Statistiken über das Wörterbuch zurück"""
-        return {
-            "total_terms": len(self.terms),
-            "total_categories": len(self.categories),
-            "total_synonyms": len(self.synonyms),
-            "terms_by_category": {cat: len(terms) for cat, terms in self.categories.items()},
-            "timestamp": datetime.now().isoformat(),
-        }
+        if self._stats_dirty or self._stats_cache is None:
+            self._stats_cache = {
+                "total_terms": len(self.terms),
+                "total_categories": len(self.categories),
+                "total_synonyms": len(self.synonyms),
+                "terms_by_category": {cat: len(terms) for cat, terms in self.categories.items()},
+            }
+            self._stats_dirty = False
+
+        return {**self._stats_cache, "timestamp": datetime.now().isoformat()}
 
 
 # Singleton instance
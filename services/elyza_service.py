@@ -13,13 +13,27 @@ backward compatibility with simple pattern-based responses.
 Feature Flag: ENABLE_ELYZA_FALLBACK (environment variable)
 """
 
-import os
+import asyncio
 import random
 import re
+from collections import deque
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from config.settings import enhanced_logger
+from utils.env_utils import parse_bool_env
 
 
 class Language(str, Enum):
@@ -47,6 +61,271 @@ class AIEvolutionStage(str, Enum):
     INTERNET_SEARCH = "internet_search"  # Current: Real-time web search
 
 
+# Reply of generate_response while ENABLE_ELYZA_FALLBACK is off
+_DISABLED_RESPONSE = MappingProxyType(
+    {
+        "response": "AI-Service ist momentan nicht verfügbar.",
+        "stage": None,
+        "source": "elyza",
+        "error": "Service disabled",
+    }
+)
+
+# generate_response stages take (prompt, language, sentiment, user_id)
+_SyncStage = Callable[[str, Language, SentimentType, Optional[str]], Optional[str]]
+_AsyncStage = Callable[[str, Language, SentimentType, Optional[str]], Awaitable[Optional[str]]]
+
+# Position of each stage in ElyzaService's usage counters
+_STAGE_INDEX = {stage: index for index, stage in enumerate(AIEvolutionStage)}
+
+# Human-readable description per AI evolution stage
+_STAGE_DESCRIPTIONS = MappingProxyType(
+    {
+        AIEvolutionStage.CLASSICAL_ELIZA: "1960s Pattern Matching (Weizenbaum's ELIZA)",
+        AIEvolutionStage.TEXT_ANALYSIS: "1990s NLP and Sentiment Analysis",
+        AIEvolutionStage.RAG_KNOWLEDGE: "2020s Retrieval Augmented Generation",
+        AIEvolutionStage.INTERNET_SEARCH: "Current: Real-time Web Search",
+    }
+)
+
+
+# Sentiment-based fallback replies (text analysis stage)
+_SENTIMENT_RESPONSES = MappingProxyType(
+    {
+        SentimentType.POSITIVE: MappingProxyType(
+            {
+                Language.GERMAN: ("Das freut mich zu hören!", "Schön, dass es gut läuft!"),
+                Language.ENGLISH: ("Great to hear!", "Nice that things are going well!"),
+            }
+        ),
+        SentimentType.NEGATIVE: MappingProxyType(
+            {
+                Language.GERMAN: (
+                    "Das tut mir leid. Wie kann ich helfen?",
+                    "Ich verstehe die Frustration.",
+                ),
+                Language.ENGLISH: (
+                    "I'm sorry to hear that. How can I help?",
+                    "I understand the frustration.",
+                ),
+            }
+        ),
+        SentimentType.QUESTION: MappingProxyType(
+            {
+                Language.GERMAN: ("Das ist eine interessante Frage!", "Gute Frage!"),
+                Language.ENGLISH: ("That's an interesting question!", "Good question!"),
+            }
+        ),
+    }
+)
+_NO_RESPONSES: Mapping[Language, Tuple[str, ...]] = MappingProxyType({})
+
+
+def _trie_pattern(words: Tuple[str, ...]) -> str:
+    """
+    Build a prefix-factored regex alternation for a keyword set.
+
+    Words sharing a prefix share one branch ("wa(?:nn|rum|s)"), so the regex
+    engine tests each leading character once instead of once per word.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return build(trie)
+
+
+# Common English words/patterns
+_ENGLISH_INDICATORS = (
+    "the",
+    "is",
+    "are",
+    "what",
+    "how",
+    "when",
+    "where",
+    "why",
+    "you",
+    "your",
+    "my",
+    "can",
+    "could",
+    "would",
+    "should",
+)
+
+# Common German words/patterns
+_GERMAN_INDICATORS = (
+    "der",
+    "die",
+    "das",
+    "ist",
+    "sind",
+    "wie",
+    "was",
+    "wann",
+    "wo",
+    "warum",
+    "du",
+    "dein",
+    "mein",
+    "kann",
+    "könnte",
+)
+
+_ENGLISH_WORDS = frozenset(_ENGLISH_INDICATORS)
+_GERMAN_WORDS = frozenset(_GERMAN_INDICATORS)
+
+
+# Question indicators (whole words, plus "?")
+_QUESTION_INDICATORS = (
+    "wie",
+    "was",
+    "wann",
+    "wo",
+    "warum",
+    "wer",
+    "welche",
+    "how",
+    "what",
+    "when",
+    "where",
+    "why",
+    "who",
+    "which",
+)
+
+# Positive indicators
+_POSITIVE_INDICATORS = (
+    "toll",
+    "super",
+    "gut",
+    "klasse",
+    "danke",
+    "prima",
+    "perfekt",
+    "great",
+    "good",
+    "excellent",
+    "awesome",
+    "thanks",
+    "perfect",
+)
+
+# Negative indicators
+_NEGATIVE_INDICATORS = (
+    "problem",
+    "fehler",
+    "schlecht",
+    "nicht",
+    "falsch",
+    "error",
+    "bad",
+    "wrong",
+    "issue",
+    "fail",
+    "broken",
+)
+
+_QUESTION_WORDS = frozenset(_QUESTION_INDICATORS)
+
+# Positive/negative words only need a word start so inflections ("gutes",
+# "failed") still count; question words must match as whole words.
+_SENTIMENT_PREFIXES = _POSITIVE_INDICATORS + _NEGATIVE_INDICATORS
+_POSITIVE_PREFIXES = frozenset(_POSITIVE_INDICATORS)
+
+# Words of a prompt: indicators are looked up in the set of its lowercased words
+_WORD_RE = re.compile(r"\w+")
+
+
+# Keywords hinting that a prompt needs current information
+_CURRENT_INFO_KEYWORDS = (
+    "aktuell",
+    "heute",
+    "jetzt",
+    "neueste",
+    "wetter",
+    "news",
+    "current",
+    "today",
+    "now",
+    "latest",
+    "recent",
+    "weather",
+)
+
+# Only the word start is anchored so inflections ("aktuellen", "neuesten") still match
+_CURRENT_INFO_RE = re.compile(r"\b" + _trie_pattern(_CURRENT_INFO_KEYWORDS), re.IGNORECASE)
+
+# Backreferences (\1, (?P=name), (?(1)...)) break once a pattern is wrapped in a
+# fused alternation; such patterns are searched one by one instead
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+def _prompt_words(text: str) -> Set[str]:
+    """Distinct lowercased words of a prompt, shared by language and sentiment detection."""
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def _language_of(words: Set[str]) -> Language:
+    """More distinct English than German indicator words means English."""
+    if len(words & _ENGLISH_WORDS) > len(words & _GERMAN_WORDS):
+        return Language.ENGLISH
+
+    return Language.GERMAN
+
+
+def _sentiment_of(text: str, words: Set[str]) -> SentimentType:
+    """Sentiment from a prompt and its words; any question indicator wins outright."""
+    if "?" in text or not _QUESTION_WORDS.isdisjoint(words):
+        return SentimentType.QUESTION
+
+    # Distinct positive/negative indicators; most words fail the tuple prefilter
+    positive_words = set()
+    negative_words = set()
+    for word in words:
+        if word.startswith(_SENTIMENT_PREFIXES):
+            prefix = next(p for p in _SENTIMENT_PREFIXES if word.startswith(p))
+            if prefix in _POSITIVE_PREFIXES:
+                positive_words.add(prefix)
+            else:
+                negative_words.add(prefix)
+    positive_count = len(positive_words)
+    negative_count = len(negative_words)
+
+    if positive_count > negative_count and positive_count > 0:
+        return SentimentType.POSITIVE
+    elif negative_count > positive_count and negative_count > 0:
+        return SentimentType.NEGATIVE
+
+    return SentimentType.NEUTRAL
+
+
+def _freeze_pattern(entry: Dict[str, Any]) -> Mapping[str, Any]:
+    """Read-only view of a pattern entry with tuple response lists."""
+    frozen = dict(entry)
+    responses = entry["responses"]
+    if isinstance(responses, Mapping):
+        frozen["responses"] = MappingProxyType(
+            {language: tuple(texts) for language, texts in responses.items()}
+        )
+    elif isinstance(responses, list):
+        frozen["responses"] = tuple(responses)
+    return MappingProxyType(frozen)
+
+
 class ElyzaService:
     """
     Evolutionary AI Playground - Demonstrating AI development from 1960s to today.
@@ -76,12 +355,44 @@ class ElyzaService:
         # result includes: response text, stage used, metadata
     """
 
+    __slots__ = (
+        "enabled",
+        "_disabled_warned",
+        "_rng",
+        "patterns",
+        "_pattern_regexes",
+        "_pattern_responses",
+        "_pattern_matcher",
+        "_unfused_pattern_indexes",
+        "_pattern_count_de",
+        "_pattern_count_en",
+        "responses",
+        "_responses_count",
+        "max_context_size",
+        "context",
+        "stages_enabled",
+        "_async_stages",
+        "_sync_stages",
+        "_rag_provider",
+        "_rag_init_task",
+        "_total_requests",
+        "_stage_counts",
+    )
+
     def __init__(self):
         self.enabled = self._check_feature_flag()
+        self._disabled_warned = False
+        self._rng = random.Random()  # Response selection
         self.patterns = self._initialize_patterns()
+        self._index_patterns()
         self.responses = self._initialize_responses()
-        self.context: Dict[str, List[str]] = {}  # Per-user context
+        self._responses_count = sum(
+            len(by_language[language])
+            for by_language in self.responses.values()
+            for language in by_language
+        )
         self.max_context_size = 10
+        self.context: Dict[str, Deque[str]] = {}  # Per-user context
 
         # Stage configuration - which stages are enabled
         self.stages_enabled = {
@@ -91,11 +402,34 @@ class ElyzaService:
             AIEvolutionStage.INTERNET_SEARCH: self._check_internet_enabled(),
         }
 
-        # Statistics tracking
-        self.stats = {
-            "total_requests": 0,
-            "stage_usage": {stage.value: 0 for stage in AIEvolutionStage},
-        }
+        # (stage, method) for enabled stages, most advanced first. The I/O stages
+        # are all more advanced than the CPU-only ones, which are not awaited.
+        self._async_stages: Tuple[Tuple[AIEvolutionStage, _AsyncStage], ...] = tuple(
+            (stage, method)
+            for stage, method in (
+                (AIEvolutionStage.INTERNET_SEARCH, self._try_internet_search),
+                (AIEvolutionStage.RAG_KNOWLEDGE, self._try_rag_knowledge),
+            )
+            if self.stages_enabled[stage]
+        )
+        self._sync_stages: Tuple[Tuple[AIEvolutionStage, _SyncStage], ...] = tuple(
+            (stage, method)
+            for stage, method in (
+                (AIEvolutionStage.TEXT_ANALYSIS, self._try_text_analysis),
+                (AIEvolutionStage.CLASSICAL_ELIZA, self._try_classical_eliza),
+            )
+            if self.stages_enabled[stage]
+        )
+
+        # RAG provider is set up in the background, never on a request
+        self._rag_provider = None
+        self._rag_init_task: Optional["asyncio.Task[None]"] = None
+        if self.stages_enabled[AIEvolutionStage.RAG_KNOWLEDGE]:
+            self._start_rag_init()
+
+        # Statistics tracking (stage usage indexed by _STAGE_INDEX)
+        self._total_requests = 0
+        self._stage_counts = [0] * len(_STAGE_INDEX)
 
         enhanced_logger.info(
             "ElyzaService initialized - Evolutionary AI Playground",
@@ -107,187 +441,209 @@ class ElyzaService:
 
     def _check_feature_flag(self) -> bool:
         """Check if Elyza fallback is enabled via environment variable."""
-        enabled_str = os.getenv("ENABLE_ELYZA_FALLBACK", "false").lower()
-        return enabled_str in ["true", "1", "yes", "on"]
+        return parse_bool_env("ENABLE_ELYZA_FALLBACK")
 
     def _check_rag_enabled(self) -> bool:
         """Check if RAG integration is enabled"""
-        return os.getenv("RAG_ENABLED", "false").lower() in ["true", "1", "yes", "on"]
+        return parse_bool_env("RAG_ENABLED")
 
     def _check_internet_enabled(self) -> bool:
         """Check if internet search is enabled"""
-        return os.getenv("ELYZA_INTERNET_SEARCH", "false").lower() in ["true", "1", "yes", "on"]
+        return parse_bool_env("ELYZA_INTERNET_SEARCH")
 
-    def _initialize_patterns(self) -> List[Dict[str, Any]]:
+    def _initialize_patterns(self) -> List[Mapping[str, Any]]:
         """Initialize pattern-response mappings with multilingual support."""
-        return [
+        patterns = (
             # Greetings (German & English)
             {
-                "pattern": r"\b(hallo|hi|hey|guten\s+tag|moin|servus|hello|greetings)\b",
+                "pattern": re.compile(
+                    r"\b(hallo|hi|hey|guten\s+tag|moin|servus|hello|greetings)\b", re.IGNORECASE
+                ),
                 "responses": {
-                    Language.GERMAN: [
+                    Language.GERMAN: (
                         "Hallo! Wie kann ich dir helfen?",
                         "Hi! Was kann ich für dich tun?",
                         "Guten Tag! Wie kann ich behilflich sein?",
-                    ],
-                    Language.ENGLISH: [
+                    ),
+                    Language.ENGLISH: (
                         "Hello! How can I help you?",
                         "Hi! What can I do for you?",
                         "Greetings! How may I assist you?",
-                    ],
+                    ),
                 },
                 "category": "greeting",
                 "sentiment": SentimentType.POSITIVE,
             },
             # How are you
             {
-                "pattern": r"\b(wie\s+geht|wie\s+gehts|how\s+are\s+you|how\s+are\s+things)\b",
+                "pattern": re.compile(
+                    r"\b(wie\s+geht|wie\s+gehts|how\s+are\s+you|how\s+are\s+things)\b",
+                    re.IGNORECASE,
+                ),
                 "responses": {
-                    Language.GERMAN: [
+                    Language.GERMAN: (
                         "Mir geht es gut, danke der Nachfrage! Wie kann ich dir helfen?",
                         "Alles bestens! Was kann ich für dich tun?",
                         "Gut, danke! Wie kann ich dich unterstützen?",
-                    ],
-                    Language.ENGLISH: [
+                    ),
+                    Language.ENGLISH: (
                         "I'm doing well, thank you for asking! How can I help you?",
                         "Everything's great! What can I do for you?",
                         "Good, thanks! How can I support you?",
-                    ],
+                    ),
                 },
                 "category": "wellbeing",
                 "sentiment": SentimentType.QUESTION,
             },
             # Thanks
             {
-                "pattern": r"\b(danke|vielen\s+dank|thank\s+you|thanks|thx)\b",
+                "pattern": re.compile(
+                    r"\b(danke|vielen\s+dank|thank\s+you|thanks|thx)\b", re.IGNORECASE
+                ),
                 "responses": {
-                    Language.GERMAN: [
+                    Language.GERMAN: (
                         "Gern geschehen!",
                         "Kein Problem, gerne!",
                         "Immer wieder gerne!",
-                    ],
-                    Language.ENGLISH: [
+                    ),
+                    Language.ENGLISH: (
                         "You're welcome!",
                         "No problem, happy to help!",
                         "Anytime!",
-                    ],
+                    ),
                 },
                 "category": "thanks",
                 "sentiment": SentimentType.POSITIVE,
             },
             # Help
             {
-                "pattern": r"\b(hilfe|help|unterstützung|helfen|support|assistance)\b",
+                "pattern": re.compile(
+                    r"\b(hilfe|help|unterstützung|helfen|support|assistance)\b", re.IGNORECASE
+                ),
                 "responses": {
-                    Language.GERMAN: [
+                    Language.GERMAN: (
                         "Ich bin hier, um zu helfen! Was benötigst du?",
                         "Natürlich helfe ich gerne! Worum geht es?",
                         "Wie kann ich dir helfen? Beschreibe dein Anliegen.",
-                    ],
-                    Language.ENGLISH: [
+                    ),
+                    Language.ENGLISH: (
                         "I'm here to help! What do you need?",
                         "Of course I'll help! What's the issue?",
                         "How can I assist you? Please describe your concern.",
-                    ],
+                    ),
                 },
                 "category": "help",
                 "sentiment": SentimentType.QUESTION,
             },
             # Questions about name/identity
             {
-                "pattern": r"\b(wer\s+bist\s+du|dein\s+name|who\s+are\s+you|what\s+are\s+you)\b",
+                "pattern": re.compile(
+                    r"\b(wer\s+bist\s+du|dein\s+name|who\s+are\s+you|what\s+are\s+you)\b",
+                    re.IGNORECASE,
+                ),
                 "responses": {
-                    Language.GERMAN: [
+                    Language.GERMAN: (
                         "Ich bin Elyza - ein evolutionäres KI-System, das die Entwicklung von den 1960er Jahren bis heute demonstriert.",
                         "Ich bin Elyza, inspiriert von Joseph Weizenbaums ELIZA, aber erweitert um moderne RAG und Internet-Zugriff.",
                         "Mein Name ist Elyza. Ich zeige, wie KI sich von einfachen Mustern zu komplexem Wissen entwickelt hat.",
-                    ],
-                    Language.ENGLISH: [
+                    ),
+                    Language.ENGLISH: (
                         "I'm Elyza - an evolutionary AI system demonstrating development from the 1960s to today.",
                         "I'm Elyza, inspired by Joseph Weizenbaum's ELIZA but extended with modern RAG and internet access.",
                         "My name is Elyza. I show how AI evolved from simple patterns to complex knowledge.",
-                    ],
+                    ),
                 },
                 "category": "identity",
                 "sentiment": SentimentType.QUESTION,
             },
             # Problems/Issues
             {
-                "pattern": r"\b(problem|fehler|error|issue|funktioniert\s+nicht|not\s+working|broken)\b",
+                "pattern": re.compile(
+                    r"\b(problem|fehler|error|issue|funktioniert\s+nicht|not\s+working|broken)\b",
+                    re.IGNORECASE,
+                ),
                 "responses": {
-                    Language.GERMAN: [
+                    Language.GERMAN: (
                         "Es tut mir leid, dass es ein Problem gibt. Kannst du es näher beschreiben?",
                         "Das klingt nach einem technischen Problem. Beschreibe es bitte genauer.",
                         "Ich verstehe, dass etwas nicht funktioniert. Mehr Details würden helfen.",
-                    ],
-                    Language.ENGLISH: [
+                    ),
+                    Language.ENGLISH: (
                         "I'm sorry there's a problem. Can you describe it in more detail?",
                         "That sounds like a technical issue. Please describe it more specifically.",
                         "I understand something isn't working. More details would help.",
-                    ],
+                    ),
                 },
                 "category": "problem",
                 "sentiment": SentimentType.NEGATIVE,
             },
             # Yes/No
             {
-                "pattern": r"\b(ja|yes|genau|richtig|korrekt|correct|exactly)\b",
+                "pattern": re.compile(
+                    r"\b(ja|yes|genau|richtig|korrekt|correct|exactly)\b", re.IGNORECASE
+                ),
                 "responses": {
-                    Language.GERMAN: ["Verstanden!", "Alles klar!", "Gut zu wissen!"],
-                    Language.ENGLISH: ["Understood!", "Got it!", "Good to know!"],
+                    Language.GERMAN: ("Verstanden!", "Alles klar!", "Gut zu wissen!"),
+                    Language.ENGLISH: ("Understood!", "Got it!", "Good to know!"),
                 },
                 "category": "affirmation",
                 "sentiment": SentimentType.POSITIVE,
             },
             {
-                "pattern": r"\b(nein|no|nicht|falsch|wrong|incorrect)\b",
+                "pattern": re.compile(r"\b(nein|no|nicht|falsch|wrong|incorrect)\b", re.IGNORECASE),
                 "responses": {
-                    Language.GERMAN: ["In Ordnung.", "Verstanden.", "Okay, notiert."],
-                    Language.ENGLISH: ["Alright.", "Understood.", "Okay, noted."],
+                    Language.GERMAN: ("In Ordnung.", "Verstanden.", "Okay, notiert."),
+                    Language.ENGLISH: ("Alright.", "Understood.", "Okay, noted."),
                 },
                 "category": "negation",
                 "sentiment": SentimentType.NEUTRAL,
             },
             # Goodbye
             {
-                "pattern": r"\b(tschüss|bye|auf\s+wiedersehen|ciao|farewell|goodbye)\b",
+                "pattern": re.compile(
+                    r"\b(tschüss|bye|auf\s+wiedersehen|ciao|farewell|goodbye)\b", re.IGNORECASE
+                ),
                 "responses": {
-                    Language.GERMAN: ["Auf Wiedersehen!", "Tschüss! Bis bald!", "Bis später!"],
-                    Language.ENGLISH: ["Goodbye!", "Bye! See you soon!", "See you later!"],
+                    Language.GERMAN: ("Auf Wiedersehen!", "Tschüss! Bis bald!", "Bis später!"),
+                    Language.ENGLISH: ("Goodbye!", "Bye! See you soon!", "See you later!"),
                 },
                 "category": "goodbye",
                 "sentiment": SentimentType.NEUTRAL,
             },
-        ]
+        )
+        return [_freeze_pattern(entry) for entry in patterns]
 
-    def _initialize_responses(self) -> Dict[str, Dict[Language, List[str]]]:
+    def _initialize_responses(self) -> Mapping[str, Mapping[Language, Tuple[str, ...]]]:
         """Initialize fallback responses by category and language."""
-        return {
+        responses = {
             "default": {
-                Language.GERMAN: [
+                Language.GERMAN: (
                     "Ich habe deine Nachricht verstanden. Ich versuche verschiedene KI-Methoden, um zu antworten.",
                     "Interessante Frage! Ich durchlaufe mehrere Wissensebenen, um eine Antwort zu finden.",
                     "Deine Anfrage wurde registriert. Ich kombiniere Pattern-Matching, Textanalyse und Wissenssuche.",
-                ],
-                Language.ENGLISH: [
+                ),
+                Language.ENGLISH: (
                     "I've understood your message. I'm trying various AI methods to respond.",
                     "Interesting question! I'm going through multiple knowledge levels to find an answer.",
                     "Your request has been registered. I'm combining pattern matching, text analysis, and knowledge search.",
-                ],
+                ),
             },
             "unknown": {
-                Language.GERMAN: [
+                Language.GERMAN: (
                     "Das ist eine komplexe Frage. Mit RAG oder Internet-Zugriff könnte ich mehr dazu sagen.",
                     "Das übersteigt meine aktuellen Wissensgrenzen. Höhere KI-Stufen wären hier hilfreich.",
                     "Für diese Anfrage bräuchte ich Zugriff auf externe Wissensquellen.",
-                ],
-                Language.ENGLISH: [
+                ),
+                Language.ENGLISH: (
                     "That's a complex question. With RAG or internet access I could say more.",
                     "That exceeds my current knowledge boundaries. Higher AI stages would be helpful here.",
                     "For this request I would need access to external knowledge sources.",
-                ],
+                ),
             },
         }
+        return MappingProxyType(
+            {category: MappingProxyType(by_language) for category, by_language in responses.items()}
+        )
 
     def _detect_language(self, text: str) -> Language:
         """
@@ -299,53 +655,7 @@ class ElyzaService:
         Returns:
             Detected language (defaults to German)
         """
-        text_lower = text.lower()
-
-        # Common English words/patterns
-        english_indicators = [
-            "the",
-            "is",
-            "are",
-            "what",
-            "how",
-            "when",
-            "where",
-            "why",
-            "you",
-            "your",
-            "my",
-            "can",
-            "could",
-            "would",
-            "should",
-        ]
-
-        # Common German words/patterns
-        german_indicators = [
-            "der",
-            "die",
-            "das",
-            "ist",
-            "sind",
-            "wie",
-            "was",
-            "wann",
-            "wo",
-            "warum",
-            "du",
-            "dein",
-            "mein",
-            "kann",
-            "könnte",
-        ]
-
-        english_count = sum(1 for word in english_indicators if f" {word} " in f" {text_lower} ")
-        german_count = sum(1 for word in german_indicators if f" {word} " in f" {text_lower} ")
-
-        if english_count > german_count:
-            return Language.ENGLISH
-
-        return Language.GERMAN
+        return _language_of(_prompt_words(text))
 
     def _detect_sentiment(self, text: str) -> SentimentType:
         """
@@ -357,69 +667,33 @@ class ElyzaService:
         Returns:
             Detected sentiment type
         """
-        text_lower = text.lower()
-
-        # Question indicators
-        question_words = [
-            "?",
-            "wie",
-            "was",
-            "wann",
-            "wo",
-            "warum",
-            "wer",
-            "welche",
-            "how",
-            "what",
-            "when",
-            "where",
-            "why",
-            "who",
-            "which",
-        ]
-        if any(word in text_lower for word in question_words):
-            return SentimentType.QUESTION
-
-        # Positive indicators
-        positive_words = [
-            "toll",
-            "super",
-            "gut",
-            "klasse",
-            "danke",
-            "prima",
-            "perfekt",
-            "great",
-            "good",
-            "excellent",
-            "awesome",
-            "thanks",
-            "perfect",
-        ]
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-
-        # Negative indicators
-        negative_words = [
-            "problem",
-            "fehler",
-            "schlecht",
-            "nicht",
-            "falsch",
-            "error",
-            "bad",
-            "wrong",
-            "issue",
-            "fail",
-            "broken",
-        ]
-        negative_count = sum(1 for word in negative_words if word in text_lower)
-
-        if positive_count > negative_count and positive_count > 0:
-            return SentimentType.POSITIVE
-        elif negative_count > positive_count and negative_count > 0:
-            return SentimentType.NEGATIVE
-
-        return SentimentType.NEUTRAL
+        return _sentiment_of(text, _prompt_words(text))
+
+    def batch_detect(self, prompts: List[str]) -> List[Tuple[Language, SentimentType]]:
+        """
+        Detect language and sentiment for many prompts at once.
+
+        Each distinct prompt is analysed only once, so repeated prompts in a
+        batch (evaluation sets, replayed logs) cost a dict lookup.
+
+        Args:
+            prompts: Input texts to analyse
+
+        Returns:
+            (language, sentiment) per prompt, in input order
+        """
+        detected: Dict[str, Tuple[Language, SentimentType]] = {}
+        results = []
+        for prompt in prompts:
+            result = detected.get(prompt)
+            if result is None:
+                words = _prompt_words(prompt)
+                result = detected[prompt] = (
+                    _language_of(words),
+                    _sentiment_of(prompt, words),
+                )
+            results.append(result)
+        return results
 
     async def generate_response(
         self,
@@ -454,73 +728,28 @@ class ElyzaService:
                 - metadata: Additional information about the response
         """
         if not self.enabled:
-            enhanced_logger.warning("ElyzaService called but ENABLE_ELYZA_FALLBACK is false")
-            return {
-                "response": "AI-Service ist momentan nicht verfügbar.",
-                "stage": None,
-                "source": "elyza",
-                "error": "Service disabled",
-            }
+            if not self._disabled_warned:
+                enhanced_logger.warning("ElyzaService called but ENABLE_ELYZA_FALLBACK is false")
+                self._disabled_warned = True
+            return dict(_DISABLED_RESPONSE)
 
-        self.stats["total_requests"] += 1
+        self._total_requests += 1
 
-        # Detect language if not provided
+        # Detect language if not provided, and sentiment, from one word split
+        words = _prompt_words(prompt)
         if language is None:
-            language = self._detect_language(prompt)
-
-        # Detect sentiment
-        sentiment = self._detect_sentiment(prompt)
+            language = _language_of(words)
+        sentiment = _sentiment_of(prompt, words)
 
         # Update context
         self._update_context(prompt, user_id)
 
-        # Try stages progressively (most advanced first)
-        stages_to_try = [
-            (AIEvolutionStage.INTERNET_SEARCH, self._try_internet_search),
-            (AIEvolutionStage.RAG_KNOWLEDGE, self._try_rag_knowledge),
-            (AIEvolutionStage.TEXT_ANALYSIS, self._try_text_analysis),
-            (AIEvolutionStage.CLASSICAL_ELIZA, self._try_classical_eliza),
-        ]
-
-        for stage, method in stages_to_try:
-            if not self.stages_enabled.get(stage, False):
-                continue
-
-            try:
-                result = await method(prompt, language, sentiment, user_id)
-                if result:
-                    self.stats["stage_usage"][stage.value] += 1
-
-                    enhanced_logger.info(
-                        "ElyzaService generated response",
-                        stage=stage.value,
-                        language=language.value,
-                        sentiment=sentiment.value,
-                        user_id=user_id,
-                    )
-
-                    return {
-                        "response": result,
-                        "stage": stage.value,
-                        "language": language.value,
-                        "sentiment": sentiment.value,
-                        "source": "elyza",
-                        "fallback": True,
-                        "metadata": {
-                            "stage_description": self._get_stage_description(stage),
-                            "context_size": len(self.context.get(user_id or "default", [])),
-                        },
-                    }
-            except Exception as e:
-                enhanced_logger.warning(
-                    f"Stage {stage.value} failed",
-                    error=str(e),
-                    user_id=user_id,
-                )
-                continue
+        hit = await self._run_stages(prompt, language, sentiment, user_id)
+        if hit is not None:
+            return self._stage_response(*hit, language, sentiment, user_id)
 
         # Absolute fallback if all stages fail
-        fallback_text = random.choice(self.responses["default"][language])
+        fallback_text = self._rng.choice(self.responses["default"][language])
         return {
             "response": fallback_text,
             "stage": "fallback",
@@ -530,45 +759,178 @@ class ElyzaService:
             "fallback": True,
         }
 
+    def _stage_response(
+        self,
+        stage: AIEvolutionStage,
+        result: str,
+        language: Language,
+        sentiment: SentimentType,
+        user_id: Optional[str],
+    ) -> Dict[str, Any]:
+        """Count and log a stage hit and build its response"""
+        self._stage_counts[_STAGE_INDEX[stage]] += 1
+
+        enhanced_logger.info(
+            "ElyzaService generated response",
+            stage=stage.value,
+            language=language.value,
+            sentiment=sentiment.value,
+            user_id=user_id,
+        )
+
+        return {
+            "response": result,
+            "stage": stage.value,
+            "language": language.value,
+            "sentiment": sentiment.value,
+            "source": "elyza",
+            "fallback": True,
+            "metadata": {
+                "stage_description": self._get_stage_description(stage),
+                "context_size": len(self.context.get(user_id or "default", ())),
+            },
+        }
+
+    async def _run_stages(
+        self, prompt: str, language: Language, sentiment: SentimentType, user_id: Optional[str]
+    ) -> Optional[Tuple[AIEvolutionStage, str]]:
+        """First enabled stage (most advanced first) with a reply, and that reply"""
+        # CPU-only stages come last and are not awaited
+        for stage, async_method in self._async_stages:
+            try:
+                result = await async_method(prompt, language, sentiment, user_id)
+            except Exception as e:
+                self._log_stage_failure(stage, e, user_id)
+                continue
+            if result:
+                return stage, result
+
+        for stage, sync_method in self._sync_stages:
+            try:
+                result = sync_method(prompt, language, sentiment, user_id)
+            except Exception as e:
+                self._log_stage_failure(stage, e, user_id)
+                continue
+            if result:
+                return stage, result
+
+        return None
+
+    @staticmethod
+    def _log_stage_failure(stage: AIEvolutionStage, error: Exception, user_id: Optional[str]):
+        enhanced_logger.warning(
+            f"Stage {stage.value} failed",
+            error=str(error),
+            user_id=user_id,
+        )
+
     def _get_stage_description(self, stage: AIEvolutionStage) -> str:
         """Get human-readable description of AI stage"""
-        descriptions = {
-            AIEvolutionStage.CLASSICAL_ELIZA: "1960s Pattern Matching (Weizenbaum's ELIZA)",
-            AIEvolutionStage.TEXT_ANALYSIS: "1990s NLP and Sentiment Analysis",
-            AIEvolutionStage.RAG_KNOWLEDGE: "2020s Retrieval Augmented Generation",
-            AIEvolutionStage.INTERNET_SEARCH: "Current: Real-time Web Search",
-        }
-        return descriptions.get(stage, "Unknown stage")
+        return _STAGE_DESCRIPTIONS.get(stage, "Unknown stage")
 
-    async def _try_classical_eliza(
+    def _try_classical_eliza(
         self, prompt: str, language: Language, sentiment: SentimentType, user_id: Optional[str]
     ) -> Optional[str]:
         """
         Stage 1: Classical ELIZA pattern matching (1960s).
         This is the original Weizenbaum approach - simple pattern matching.
         """
-        prompt_lower = prompt.lower()
-
-        # Try to match patterns
-        for pattern_info in self.patterns:
-            pattern = pattern_info["pattern"]
-            if re.search(pattern, prompt_lower):
-                responses = pattern_info["responses"]
-
-                # Get response for the detected language
-                if isinstance(responses, dict):
-                    response_list = responses.get(language, responses.get(Language.GERMAN, []))
-                else:
-                    # Fallback for old-style patterns
-                    response_list = responses if isinstance(responses, list) else [responses]
+        start = self._find_first_pattern_index(prompt)
+        if start is None:
+            return None
 
-                if response_list:
-                    return random.choice(response_list)
+        # Pattern `start` is known to match; later ones only matter if it has
+        # no responses for this language
+        regexes = self._pattern_regexes
+        response_lists = self._pattern_responses[language]
+        for index in range(start, len(regexes)):
+            if index != start and not regexes[index].search(prompt):
+                continue
+            if response_lists[index]:
+                return self._rng.choice(response_lists[index])
 
         # No pattern matched
         return None
 
-    async def _try_text_analysis(
+    def _index_patterns(self):
+        """
+        Rebuild the parallel pattern arrays and the fused matcher.
+
+        Regexes and per-language response tuples are stored by pattern index,
+        so a match resolves to its responses without per-field dict lookups.
+        """
+        self._pattern_regexes = tuple(info["pattern"] for info in self.patterns)
+        self._pattern_responses = {
+            language: tuple(
+                self._responses_for(info["responses"], language) for info in self.patterns
+            )
+            for language in Language
+        }
+        self._pattern_matcher = self._compile_pattern_matcher()
+
+        # Status counters, so get_status does not rescan the pattern table
+        self._pattern_count_de = sum(
+            Language.GERMAN in info.get("responses", {}) for info in self.patterns
+        )
+        self._pattern_count_en = sum(
+            Language.ENGLISH in info.get("responses", {}) for info in self.patterns
+        )
+
+    @staticmethod
+    def _responses_for(responses: Any, language: Language) -> Tuple[str, ...]:
+        """Responses of one pattern entry for the given language."""
+        if isinstance(responses, Mapping):
+            return responses.get(language, responses.get(Language.GERMAN, ()))
+        # Fallback for old-style patterns
+        return responses if isinstance(responses, tuple) else (responses,)
+
+    def _find_first_pattern_index(self, prompt: str) -> Optional[int]:
+        """Index of the first pattern (in list order) matching the prompt, or None."""
+        regexes = self._pattern_regexes
+        if self._pattern_matcher is None:
+            return next((i for i, regex in enumerate(regexes) if regex.search(prompt)), None)
+
+        # One pass finds the leftmost hit; it also rejects most prompts outright
+        match = self._pattern_matcher.search(prompt)
+        if match is None:
+            unfused = self._unfused_pattern_indexes
+            return next((i for i in unfused if regexes[i].search(prompt)), None)
+        hit = int(match.lastgroup[1:])
+
+        # An earlier pattern may still match further right in the prompt
+        return next((i for i in range(hit) if regexes[i].search(prompt)), hit)
+
+    def _compile_pattern_matcher(self) -> Optional[re.Pattern[str]]:
+        """
+        Fuse all patterns into one alternation with a named group p<i> per pattern.
+
+        A search finds the leftmost match in a single pass over the prompt and
+        lastgroup names the pattern. Patterns with backreferences stay out of the
+        alternation (wrapping renumbers their groups) and are recorded in
+        _unfused_pattern_indexes. Returns None if nothing can be fused (e.g.
+        conflicting group names); matching then falls back to a loop.
+        """
+        fused = []
+        unfused = []
+        for index, regex in enumerate(self._pattern_regexes):
+            if _BACKREFERENCE_RE.search(regex.pattern):
+                unfused.append(index)
+            else:
+                fused.append(f"(?P<p{index}>{regex.pattern})")
+        self._unfused_pattern_indexes = tuple(unfused)
+        if not fused:
+            return None
+
+        branches = "|".join(fused)
+        try:
+            return re.compile(branches, re.IGNORECASE)
+        except re.error as e:
+            enhanced_logger.warning(
+                "Could not fuse Elyza patterns, matching one by one", error=str(e)
+            )
+            return None
+
+    def _try_text_analysis(
         self, prompt: str, language: Language, sentiment: SentimentType, user_id: Optional[str]
     ) -> Optional[str]:
         """
@@ -576,7 +938,7 @@ class ElyzaService:
         Uses NLP techniques to understand and respond based on text analysis.
         """
         # If classical ELIZA didn't match, try sentiment-based responses
-        context_messages = self.context.get(user_id or "default", [])
+        context_messages = self.context.get(user_id or "default", ())
 
         # Build context-aware response based on sentiment and conversation history
         if sentiment == SentimentType.QUESTION and len(context_messages) > 0:
@@ -587,30 +949,9 @@ class ElyzaService:
                 return "That's a good question. Based on our conversation, I'd say more details would help."
 
         # Sentiment-based fallback
-        sentiment_responses = {
-            SentimentType.POSITIVE: {
-                Language.GERMAN: ["Das freut mich zu hören!", "Schön, dass es gut läuft!"],
-                Language.ENGLISH: ["Great to hear!", "Nice that things are going well!"],
-            },
-            SentimentType.NEGATIVE: {
-                Language.GERMAN: [
-                    "Das tut mir leid. Wie kann ich helfen?",
-                    "Ich verstehe die Frustration.",
-                ],
-                Language.ENGLISH: [
-                    "I'm sorry to hear that. How can I help?",
-                    "I understand the frustration.",
-                ],
-            },
-            SentimentType.QUESTION: {
-                Language.GERMAN: ["Das ist eine interessante Frage!", "Gute Frage!"],
-                Language.ENGLISH: ["That's an interesting question!", "Good question!"],
-            },
-        }
-
-        responses = sentiment_responses.get(sentiment, {}).get(language, [])
+        responses = _SENTIMENT_RESPONSES.get(sentiment, _NO_RESPONSES).get(language, ())
         if responses:
-            return random.choice(responses)
+            return self._rng.choice(responses)
 
         return None
 
@@ -624,26 +965,15 @@ class ElyzaService:
         Note: This is a decoupled implementation that doesn't create circular dependencies.
         RAG provider can be injected via set_rag_provider() method for better testability.
         """
-        # Check if we have a RAG provider instance
-        if not hasattr(self, "_rag_provider") or self._rag_provider is None:
-            # Try to initialize RAG provider (only once)
-            try:
-                from services.rag.chroma_rag import ChromaRAGProvider
-
-                # This is optional - only if RAG is configured
-                self._rag_provider = ChromaRAGProvider({"collection_name": "documents"})
-                if self._rag_provider.is_initialized:
-                    enhanced_logger.info("RAG provider initialized for Elyza")
-                else:
-                    self._rag_provider = None
-            except (ImportError, Exception) as e:
-                enhanced_logger.debug(f"RAG provider not available: {e}")
-                self._rag_provider = None
-                return None
+        if self._rag_provider is None:
+            # Setup pending or failed; start it here if the service was built outside a loop
+            if self._rag_init_task is None and self.stages_enabled[AIEvolutionStage.RAG_KNOWLEDGE]:
+                self._start_rag_init()
+            return None
 
         # Try to use RAG provider
         try:
-            if self._rag_provider and hasattr(self._rag_provider, "query"):
+            if hasattr(self._rag_provider, "query"):
                 # Query the knowledge base
                 results = await self._rag_provider.query(prompt, top_k=3)
 
@@ -666,6 +996,31 @@ class ElyzaService:
             enhanced_logger.debug(f"RAG knowledge query failed: {e}")
             return None
 
+    def _start_rag_init(self):
+        """Schedule RAG provider setup on the running event loop, if there is one."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop yet (e.g. created at import time); retried on first RAG request
+            return
+        self._rag_init_task = loop.create_task(self._init_rag_provider())
+
+    async def _init_rag_provider(self):
+        """Create and initialize the default RAG provider (attempted once)."""
+        try:
+            from services.rag.chroma_rag import ChromaRAGProvider
+
+            # This is optional - only if RAG is configured
+            provider = ChromaRAGProvider({"collection_name": "documents"})
+            await provider.initialize()
+        except Exception as e:
+            enhanced_logger.debug(f"RAG provider not available: {e}")
+            return
+
+        if self._rag_provider is None:
+            self._rag_provider = provider
+            enhanced_logger.info("RAG provider initialized for Elyza")
+
     def set_rag_provider(self, provider):
         """
         Inject RAG provider for better testability and decoupling.
@@ -683,26 +1038,7 @@ class ElyzaService:
         Searches the web for real-time information.
         """
         # Check if this looks like a question that needs current information
-        current_info_keywords = [
-            "aktuell",
-            "heute",
-            "jetzt",
-            "neueste",
-            "aktuelle",
-            "wetter",
-            "news",
-            "current",
-            "today",
-            "now",
-            "latest",
-            "recent",
-            "weather",
-            "news",
-        ]
-
-        needs_current_info = any(keyword in prompt.lower() for keyword in current_info_keywords)
-
-        if not needs_current_info:
+        if not _CURRENT_INFO_RE.search(prompt):
             return None
 
         try:
@@ -733,17 +1069,17 @@ class ElyzaService:
     def _update_context(self, message: str, user_id: Optional[str] = None):
         """Update conversation context per user."""
         key = user_id or "default"
-        if key not in self.context:
-            self.context[key] = []
+        messages = self.context.get(key)
+        if messages is None:
+            messages = self.context[key] = deque(maxlen=self.max_context_size)
 
-        self.context[key].append(message)
-        if len(self.context[key]) > self.max_context_size:
-            self.context[key].pop(0)
+        # Bounded deque drops the oldest message on overflow
+        messages.append(message)
 
     def get_context(self, user_id: Optional[str] = None) -> List[str]:
         """Get current conversation context for a user."""
         key = user_id or "default"
-        return self.context.get(key, []).copy()
+        return list(self.context.get(key, ()))
 
     def clear_context(self, user_id: Optional[str] = None) -> bool:
         """
@@ -770,18 +1106,24 @@ class ElyzaService:
         """Check if service is available (alias for is_enabled for compatibility)."""
         return self.enabled
 
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Request and per-stage usage counters."""
+        return {
+            "total_requests": self._total_requests,
+            "stage_usage": {
+                stage.value: count for stage, count in zip(_STAGE_INDEX, self._stage_counts)
+            },
+        }
+
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive service statistics."""
-        total_responses = sum(
-            len(responses[lang]) for responses in self.responses.values() for lang in responses
-        )
-
         return {
             "enabled": self.enabled,
             "patterns_count": len(self.patterns),
-            "responses_count": total_responses,
-            "total_requests": self.stats["total_requests"],
-            "stage_usage": self.stats["stage_usage"].copy(),
+            "responses_count": self._responses_count,
+            "total_requests": self._total_requests,
+            "stage_usage": self.stats["stage_usage"],
             "stages_enabled": {k.value: v for k, v in self.stages_enabled.items()},
             "active_users": len(self.context),
             "max_context_size": self.max_context_size,
@@ -797,14 +1139,10 @@ class ElyzaService:
         return {
             "service": "elyza",
             "enabled": self.enabled,
-            "pattern_count_de": len(
-                [p for p in self.patterns if Language.GERMAN in p.get("responses", {})]
-            ),
-            "pattern_count_en": len(
-                [p for p in self.patterns if Language.ENGLISH in p.get("responses", {})]
-            ),
+            "pattern_count_de": self._pattern_count_de,
+            "pattern_count_en": self._pattern_count_en,
             "stages_available": list(self.stages_enabled.keys()),
-            "total_requests": self.stats["total_requests"],
+            "total_requests": self._total_requests,
         }
 
     def add_custom_pattern(
@@ -817,21 +1155,29 @@ class ElyzaService:
         """
         Add a custom pattern-response mapping with multilingual support.
 
+        Patterns run on Python's backtracking ``re`` engine, fused into one
+        alternation with the built-in patterns (patterns with backreferences
+        are searched separately); avoid nested quantifiers such as ``(a+)+``
+        that can backtrack exponentially on long prompts.
+
         Args:
-            pattern: Regex pattern to match
+            pattern: Regex pattern to match (compiled case-insensitively)
             responses: Dict mapping Language to list of responses
                       e.g., {Language.GERMAN: ["Antwort"], Language.ENGLISH: ["Answer"]}
             category: Category name for logging
             sentiment: Default sentiment type for this pattern
         """
         self.patterns.append(
-            {
-                "pattern": pattern,
-                "responses": responses,
-                "category": category,
-                "sentiment": sentiment,
-            }
+            _freeze_pattern(
+                {
+                    "pattern": re.compile(pattern, re.IGNORECASE),
+                    "responses": responses,
+                    "category": category,
+                    "sentiment": sentiment,
+                }
+            )
         )
+        self._index_patterns()
 
         enhanced_logger.info(
             "Custom pattern added to ElyzaService", category=category, pattern=pattern
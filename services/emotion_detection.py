@@ -6,9 +6,47 @@ Handles emotion detection from text, audio, and video inputs.
 This is a placeholder for the planned emotion detection system.
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from config.settings import logger
+from config.settings import logger, settings
+
+# Cache-Modi: on, off, read_only (nur lesen), write_only (nur füllen)
+_CACHE_MODES = frozenset({"on", "off", "read_only", "write_only"})
+
+# Feste Felder der Platzhalter-Antworten. "emotions" wird pro Aufruf ersetzt;
+# der Platzhalter hält nur die Feldreihenfolge der Antworten fest.
+_PLACEHOLDER_FIELDS: Dict[str, Any] = {
+    "emotions": None,
+    "dominant_emotion": "neutral",
+    "confidence": 0.0,
+    "status": "not_implemented",
+}
+_TEXT_RESPONSE = {
+    "input_type": "text",
+    **_PLACEHOLDER_FIELDS,
+    "message": "Text emotion detection not yet implemented",
+}
+_AUDIO_RESPONSE = {
+    "input_type": "audio",
+    **_PLACEHOLDER_FIELDS,
+    "message": "Audio emotion detection not yet implemented",
+}
+_VIDEO_RESPONSE = {
+    "input_type": "video",
+    "emotions": None,
+    "dominant_emotion": "neutral",
+    "confidence": 0.0,
+    "face_detected": False,
+    "status": "not_implemented",
+    "message": "Video emotion detection not yet implemented",
+}
+_MULTIMODAL_RESPONSE = {
+    **_PLACEHOLDER_FIELDS,
+    "message": "Multimodal emotion detection not yet implemented",
+}
 
 
 class EmotionDetectionService:
@@ -25,10 +63,68 @@ class EmotionDetectionService:
     # Unterstützte Emotionen
     EMOTIONS = ["happy", "sad", "angry", "surprised", "fearful", "disgusted", "neutral", "contempt"]
 
-    def __init__(self):
+    # Null-Scores je Emotion, pro Antwort nur kopiert
+    _EMOTION_ZEROS: Dict[str, float] = dict.fromkeys(EMOTIONS, 0.0)
+
+    def __init__(
+        self,
+        cache_size: int = 10_000,
+        cache_mode: Optional[str] = None,
+        cache_ttl: Optional[float] = None,
+    ):
+        self.model: Optional[Any] = None
         self.model_loaded = False
+
+        # LRU/TTL-Cache für Text-Ergebnisse, aktiv sobald ein Modell geladen ist (0 = aus)
+        self.cache_size = cache_size
+        self.cache_mode = (cache_mode or settings.EMOTION_CACHE_MODE).lower()
+        if self.cache_mode not in _CACHE_MODES:
+            logger.warning(f"⚠️ Unknown emotion cache mode {self.cache_mode!r}, using 'on'")
+            self.cache_mode = "on"
+        self.cache_ttl = settings.EMOTION_CACHE_TTL if cache_ttl is None else cache_ttl
+        self._text_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # Microbatching: gleichzeitige Text-Anfragen teilen sich einen Modellaufruf
+        self.max_batch_size = 32
+        self.max_batch_wait = 0.01  # seconds
+        self._pending_texts: List[Tuple[str, "asyncio.Future[Dict[str, Any]]"]] = []
+        self._batch_timer: Optional["asyncio.Task[None]"] = None
+        self._batch_tasks: Set["asyncio.Task[None]"] = set()  # laufende Batches referenziert halten
+
         logger.info("🎭 Emotion Detection Service initialized (placeholder)")
 
+    async def warmup(self) -> bool:
+        """
+        Lädt das Modell beim App-Start und führt einen Probelauf aus,
+        damit die erste Anfrage nicht Ladezeit und ersten Forward-Pass trägt
+
+        Returns:
+            True, wenn ein Modell geladen ist
+        """
+        if self.model_loaded:
+            return True
+
+        try:
+            model = await asyncio.to_thread(self._load_model)
+            if model is None:
+                logger.info("🎭 No emotion model available, staying in placeholder mode")
+                return False
+
+            self.model = model
+            await self._infer_text_batch(["warmup"])
+            self.model_loaded = True
+            logger.info("🎭 Emotion model loaded and warmed up")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Emotion model warmup failed: {e}")
+            return False
+
+    def _load_model(self) -> Optional[Any]:
+        """Lädt die Modellgewichte (Platzhalter: noch kein Modell)"""
+        return None
+
     async def detect_from_text(self, text: str) -> Dict[str, Any]:
         """
         Erkennt Emotionen aus Text
@@ -39,14 +135,81 @@ class EmotionDetectionService:
         Returns:
             Dict mit erkannten Emotionen und Konfidenz
         """
-        return {
-            "input_type": "text",
-            "emotions": {emotion: 0.0 for emotion in self.EMOTIONS},
-            "dominant_emotion": "neutral",
-            "confidence": 0.0,
-            "status": "not_implemented",
-            "message": "Text emotion detection not yet implemented",
-        }
+        # Platzhalter-Antworten werden nicht gecacht
+        if not self.model_loaded or not self.cache_size or self.cache_mode == "off":
+            return await self._infer_text(text)
+
+        now = time.monotonic()
+        cached = None if self.cache_mode == "write_only" else self._text_cache.get(text)
+        if cached is not None and cached[0] > now:
+            self._cache_hits += 1
+            self._text_cache.move_to_end(text)
+            result = cached[1]
+        else:
+            self._cache_misses += 1
+            result = await self._infer_text(text)
+            if self.cache_mode != "read_only":
+                self._text_cache[text] = (now + self.cache_ttl, result)
+                self._text_cache.move_to_end(text)
+                if len(self._text_cache) > self.cache_size:
+                    self._text_cache.popitem(last=False)
+
+        # Kopie, damit Aufrufer den Cache-Eintrag nicht verändern
+        return {**result, "emotions": result["emotions"].copy()}
+
+    async def _infer_text(self, text: str) -> Dict[str, Any]:
+        """Reiht Text in den nächsten Batch ein und wartet auf dessen Ergebnis"""
+        if not self.model_loaded:
+            return (await self._infer_text_batch([text]))[0]
+
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._pending_texts.append((text, future))
+
+        if len(self._pending_texts) >= self.max_batch_size:
+            self._start_text_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = asyncio.create_task(self._run_text_batch_after_wait())
+
+        # Der Batch läuft in eigenem Task; ein abgebrochener Aufrufer beendet ihn nicht
+        return await asyncio.shield(future)
+
+    async def _run_text_batch_after_wait(self) -> None:
+        await asyncio.sleep(self.max_batch_wait)
+        self._batch_timer = None
+        self._start_text_batch()
+
+    def _start_text_batch(self) -> None:
+        """Übergibt alle wartenden Text-Anfragen an einen neuen Batch-Task"""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+
+        batch, self._pending_texts = self._pending_texts, []
+        if batch:
+            task = asyncio.create_task(self._run_text_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_text_batch(self, batch: List[Tuple[str, "asyncio.Future[Any]"]]) -> None:
+        """Führt einen Batch von Text-Anfragen in einem Modellaufruf aus"""
+        try:
+            results = await self._infer_text_batch([text for text, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # Kein Aufrufer bleibt hängen, auch wenn der Batch-Task abgebrochen wurde
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Emotion batch did not complete"))
+
+    async def _infer_text_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Modellaufruf für mehrere Texte (Platzhalter)"""
+        return [{**_TEXT_RESPONSE, "emotions": self._EMOTION_ZEROS.copy()} for _ in texts]
 
     async def detect_from_audio(self, audio_data: bytes) -> Dict[str, Any]:
         """
@@ -58,14 +221,7 @@ class EmotionDetectionService:
         Returns:
             Dict mit erkannten Emotionen
         """
-        return {
-            "input_type": "audio",
-            "emotions": {emotion: 0.0 for emotion in self.EMOTIONS},
-            "dominant_emotion": "neutral",
-            "confidence": 0.0,
-            "status": "not_implemented",
-            "message": "Audio emotion detection not yet implemented",
-        }
+        return {**_AUDIO_RESPONSE, "emotions": self._EMOTION_ZEROS.copy()}
 
     async def detect_from_video(self, video_frame: bytes) -> Dict[str, Any]:
         """
@@ -77,15 +233,7 @@ class EmotionDetectionService:
         Returns:
             Dict mit erkannten Emotionen
         """
-        return {
-            "input_type": "video",
-            "emotions": {emotion: 0.0 for emotion in self.EMOTIONS},
-            "dominant_emotion": "neutral",
-            "confidence": 0.0,
-            "face_detected": False,
-            "status": "not_implemented",
-            "message": "Video emotion detection not yet implemented",
-        }
+        return {**_VIDEO_RESPONSE, "emotions": self._EMOTION_ZEROS.copy()}
 
     async def detect_multimodal(
         self,
@@ -110,17 +258,25 @@ class EmotionDetectionService:
                 "audio": audio is not None,
                 "video": video is not None,
             },
-            "emotions": {emotion: 0.0 for emotion in self.EMOTIONS},
-            "dominant_emotion": "neutral",
-            "confidence": 0.0,
-            "status": "not_implemented",
-            "message": "Multimodal emotion detection not yet implemented",
+            **_MULTIMODAL_RESPONSE,
+            "emotions": self._EMOTION_ZEROS.copy(),
         }
 
     async def get_emotion_history(self, user_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Gibt Emotionshistorie für einen Benutzer zurück"""
         return []
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Gibt Trefferstatistik des Text-Caches zurück"""
+        return {
+            "mode": self.cache_mode,
+            "ttl": self.cache_ttl,
+            "size": len(self._text_cache),
+            "max_size": self.cache_size,
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+        }
+
     def get_supported_emotions(self) -> List[str]:
         """Gibt Liste unterstützter Emotionen zurück"""
         return self.EMOTIONS
@@ -263,7 +263,7 @@ class ExternalAIUnavailableError(ExternalServiceError):
         except ExternalAIUnavailableError:
             # Fallback to Elyza or other simple response
             if ENABLE_ELYZA_FALLBACK:
-                response = elyza_service.generate_response(prompt)
+                response = await get_elyza_service().generate_response(prompt)
     """
 
     error_code = "AI_SERVICE_UNAVAILABLE"
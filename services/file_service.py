@@ -1,18 +1,90 @@
+import asyncio
 import hashlib
 import os
-import uuid
+import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import aiofiles
 from fastapi import UploadFile
 
 from config.settings import enhanced_logger, logger, settings
 from database.models import File, FileType, create_file
 from database.repositories import FileRepository, ProjectRepository, UserRepository
 
+# Bytes read from an upload per iteration while streaming it to disk
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Keyword sentiment for text analysis (substring checks on the lowercased content)
+_POSITIVE_WORDS = ("good", "great", "excellent", "awesome", "amazing")
+_NEGATIVE_WORDS = ("bad", "terrible", "awful", "horrible", "poor")
+
+# ASCII byte -> 0 for str.split() separators, 1 for word characters
+_ASCII_WORD_FLAGS = bytes(0 if chr(i).isspace() else 1 for i in range(256))
+
+# MIME type -> FileType dispatch for _determine_file_type
+_DOCUMENT_MIME_TYPES = {
+    "application/pdf": FileType.DOCUMENT,
+    "application/msword": FileType.DOCUMENT,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": FileType.DOCUMENT,
+}
+_TOP_LEVEL_MIME_TYPES = {
+    "image": FileType.IMAGE,
+    "audio": FileType.AUDIO,
+    "video": FileType.VIDEO,
+    "text": FileType.CODE,
+}
+_ARCHIVE_MIME_PREFIXES = ("application/zip", "application/x-rar")
+_DATA_EXTENSIONS = frozenset({"csv", "json", "xml", "xlsx", "xls"})
+
+# Upload whitelist, resolved once at import (settings are fixed for the process)
+_ALLOWED_EXTENSIONS = frozenset(ext.lower() for ext in settings.ALLOWED_EXTENSIONS)
+
+# LRU cache of file records shared by every FileService instance (routes and
+# dependencies each build their own). Only download_count changes after upload:
+# increments through the service evict the entry, and the TTL bounds how long
+# counts bumped by other worker processes stay stale.
+_FILE_CACHE: "OrderedDict[str, Tuple[float, File]]" = OrderedDict()
+_MAX_CACHED_FILES = 4096
+_FILE_CACHE_TTL = 30.0
+
+
+def _word_count(content: str) -> int:
+    """len(content.split()) without building the word list when the text is ASCII"""
+    if not content.isascii():
+        return len(content.split())
+
+    # A word starts wherever a separator byte is followed by a word byte
+    flags = content.encode("ascii").translate(_ASCII_WORD_FLAGS)
+    return flags.count(b"\x00\x01") + flags.startswith(b"\x01")
+
+
+def _sentiment_fields(content: str) -> Dict[str, Any]:
+    """Keyword sentiment: each positive/negative word found in the text counts once"""
+    content_lower = content.lower()
+    positive_count = sum(word in content_lower for word in _POSITIVE_WORDS)
+    negative_count = sum(word in content_lower for word in _NEGATIVE_WORDS)
+
+    if positive_count > negative_count:
+        sentiment = "positive"
+    elif negative_count > positive_count:
+        sentiment = "negative"
+    else:
+        sentiment = "neutral"
+
+    return {"sentiment": sentiment, "sentiment_score": positive_count - negative_count}
+
 
 class FileService:
+    __slots__ = (
+        "file_repo",
+        "project_repo",
+        "user_repo",
+    )
+
     def __init__(self, file_repository: FileRepository):
         self.file_repo = file_repository
         self.project_repo = ProjectRepository()
@@ -23,11 +95,17 @@ class FileService:
 
         logger.info("🔄 FileService initialized")
 
+    @staticmethod
+    def _file_extension(filename: str) -> str:
+        """Lowercase extension without the leading dot ("" if there is none)"""
+        return os.path.splitext(filename)[1][1:].lower()
+
     def allowed_file(self, filename: str) -> bool:
         """Check if file extension is allowed"""
-        return (
-            "." in filename and filename.rsplit(".", 1)[1].lower() in settings.ALLOWED_EXTENSIONS
-        )  # Korrigiert: settings.ALLOWED_EXTENSIONS
+        return self._extension_allowed(self._file_extension(filename))
+
+    def _extension_allowed(self, extension: str) -> bool:
+        return bool(extension) and extension in _ALLOWED_EXTENSIONS
 
     async def save_uploaded_file(
         self,
@@ -39,27 +117,29 @@ class FileService:
         is_public: bool = False,
     ) -> File:
         """Save uploaded file and create database record"""
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
 
         try:
             if not file or not file.filename:
                 raise ValueError("No file provided")
 
-            if not self.allowed_file(file.filename):
+            file_extension = self._file_extension(file.filename)
+            if not self._extension_allowed(file_extension):
                 raise ValueError(f"File type not allowed: {file.filename}")
 
             # Generate unique filename
-            file_extension = file.filename.rsplit(".", 1)[1].lower()
-            unique_filename = f"{uuid.uuid4().hex}.{file_extension}"
+            unique_filename = f"{secrets.token_hex(16)}.{file_extension}"
             file_path = os.path.join(settings.UPLOAD_FOLDER, unique_filename)  # Korrigiert
 
-            # Save file
-            content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(content)
-
-            # Calculate file hash
-            file_hash = self._calculate_file_hash(file_path)
+            # Stream file to disk, hashing and sizing it in the same pass
+            hasher = hashlib.sha256()
+            file_size = 0
+            async with aiofiles.open(file_path, "wb") as f:
+                while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    hasher.update(chunk)
+                    await f.write(chunk)
+            file_hash = hasher.hexdigest()
 
             # Note: _determine_file_type() method available for future validation
 
@@ -69,7 +149,7 @@ class FileService:
                 original_filename=file.filename,
                 stored_filename=unique_filename,
                 file_path=file_path,
-                file_size=len(content),
+                file_size=file_size,
                 file_hash=file_hash,
                 mime_type=safe_mime_type,
                 uploaded_by=username,
@@ -79,15 +159,16 @@ class FileService:
                 is_public=is_public,
             )
 
-            file_id = self.file_repo.save_file(file_record)
+            # sqlite insert is blocking; keep it off the event loop
+            file_id = await asyncio.to_thread(self.file_repo.save_file, file_record)
             file_record.id = file_id
 
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
             enhanced_logger.info(
                 "File uploaded successfully",
                 file_id=file_id,
                 filename=file.filename,
-                file_size=len(content),
+                file_size=file_size,
                 uploaded_by=username,
                 project_id=project_id,
                 duration=duration,
@@ -95,7 +176,7 @@ class FileService:
             return file_record
 
         except Exception as e:
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
             enhanced_logger.error(
                 "Failed to upload file",
                 error=str(e),
@@ -104,68 +185,57 @@ class FileService:
             )
             raise
 
-    def _calculate_file_hash(self, file_path: str) -> str:
-        """Calculate MD5 hash of file"""
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
-
-    def _determine_file_type(self, filename: str, mime_type: Optional[str]) -> FileType:
+    def _determine_file_type(
+        self, filename: str, mime_type: Optional[str], extension: Optional[str] = None
+    ) -> FileType:
         """Determine file type from filename and MIME type"""
         # Check by MIME type first
-        if mime_type and mime_type.startswith("image/"):
-            return FileType.IMAGE
-        elif mime_type and mime_type.startswith("audio/"):
-            return FileType.AUDIO
-        elif mime_type and mime_type.startswith("video/"):
-            return FileType.VIDEO
-        elif mime_type and mime_type in [
-            "application/pdf",
-            "application/msword",
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        ]:
-            return FileType.DOCUMENT
-        elif mime_type and (mime_type.startswith("text/") or "code" in mime_type):
-            return FileType.CODE
-        elif mime_type and (
-            mime_type.startswith("application/zip") or mime_type.startswith("application/x-rar")
-        ):
-            return FileType.ARCHIVE
+        if mime_type:
+            file_type = _DOCUMENT_MIME_TYPES.get(mime_type)
+            if file_type is not None:
+                return file_type
+
+            top_level, slash, _ = mime_type.partition("/")
+            if slash and top_level in _TOP_LEVEL_MIME_TYPES:
+                return _TOP_LEVEL_MIME_TYPES[top_level]
+
+            if "code" in mime_type:
+                return FileType.CODE
+            if mime_type.startswith(_ARCHIVE_MIME_PREFIXES):
+                return FileType.ARCHIVE
 
         # Fallback to filename extension
-        extension = filename.rsplit(".", 1)[1].lower() if "." in filename else ""
-        if extension in ["csv", "json", "xml", "xlsx", "xls"]:
+        if extension is None:
+            extension = self._file_extension(filename)
+        if extension in _DATA_EXTENSIONS:
             return FileType.DATA
 
         return FileType.OTHER
 
     def get_file(self, file_id: str) -> Optional[File]:
         """Get file by ID"""
-        try:
-            file_record = self.file_repo.get_file(file_id)
-            if file_record:
-                logger.debug(f"📄 Retrieved file: {file_record.original_filename}")
-            return file_record
-        except Exception as e:
-            logger.error(f"❌ Failed to get file {file_id}: {e}")
+        cached = _FILE_CACHE.get(file_id)
+        if cached is not None and cached[0] > time.monotonic():
+            _FILE_CACHE.move_to_end(file_id)
+            return cached[1]
+
+        # The repository logs database errors itself and returns None
+        file_record = self.file_repo.get_file(file_id)
+        if file_record is None:
             return None
 
+        logger.debug(f"📄 Retrieved file: {file_record.original_filename}")
+        _FILE_CACHE[file_id] = (time.monotonic() + _FILE_CACHE_TTL, file_record)
+        _FILE_CACHE.move_to_end(file_id)
+        if len(_FILE_CACHE) > _MAX_CACHED_FILES:
+            _FILE_CACHE.popitem(last=False)
+        return file_record
+
     def get_project_files(self, project_id: str) -> List[File]:
         """Get all files for a project"""
-        try:
-            # Retrieve files for the given project using file_repo.get_files with a filter
-            project_files = [
-                file for file in self.file_repo.get_files() if file.project_id == project_id
-            ]
-
-            logger.info(f"✅ Retrieved {len(project_files)} files for project {project_id}")
-            return project_files
-
-        except Exception as e:
-            logger.error(f"❌ Failed to get project files: {e}")
-            return []
+        project_files = self.file_repo.get_files_by_project(project_id)
+        logger.info(f"✅ Retrieved {len(project_files)} files for project {project_id}")
+        return project_files
 
     def analyze_uploaded_file(self, file_id: str) -> Dict[str, Any]:
         """Analyze uploaded file (background task)"""
@@ -211,28 +281,14 @@ class FileService:
 
             analysis = {
                 "content_type": "text",
-                "word_count": len(content.split()),
+                "word_count": _word_count(content),
                 "line_count": len(content.splitlines()),
                 "character_count": len(content),
                 "content_preview": content[:500] + "..." if len(content) > 500 else content,
             }
 
             # Simple sentiment analysis based on keywords
-            positive_words = ["good", "great", "excellent", "awesome", "amazing"]
-            negative_words = ["bad", "terrible", "awful", "horrible", "poor"]
-
-            content_lower = content.lower()
-            positive_count = sum(1 for word in positive_words if word in content_lower)
-            negative_count = sum(1 for word in negative_words if word in content_lower)
-
-            if positive_count > negative_count:
-                analysis["sentiment"] = "positive"
-            elif negative_count > positive_count:
-                analysis["sentiment"] = "negative"
-            else:
-                analysis["sentiment"] = "neutral"
-
-            analysis["sentiment_score"] = positive_count - negative_count
+            analysis.update(_sentiment_fields(content))
 
             return analysis
 
@@ -266,53 +322,56 @@ class FileService:
     def _analyze_code_file(self, file_path: str) -> Dict[str, Any]:
         """Analyze code file"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            line_count = non_empty_lines = character_count = 0
+            has_functions = has_classes = has_comments = False
 
-            lines = content.splitlines()
-            analysis = {
+            # Stream the file; only the current line is held in memory
+            with open(file_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line_count += 1
+                    character_count += len(line)
+                    if line.isspace():
+                        continue
+                    non_empty_lines += 1
+                    if not has_comments and line.lstrip().startswith("#"):
+                        has_comments = True
+                    if not has_functions and "def " in line:
+                        has_functions = True
+                    if not has_classes and "class " in line:
+                        has_classes = True
+
+            return {
                 "content_type": "code",
-                "line_count": len(lines),
-                "character_count": len(content),
-                "non_empty_lines": len([line for line in lines if line.strip()]),
+                "line_count": line_count,
+                "character_count": character_count,
+                "non_empty_lines": non_empty_lines,
                 "estimated_complexity": (
-                    "low" if len(lines) < 50 else "medium" if len(lines) < 200 else "high"
+                    "low" if line_count < 50 else "medium" if line_count < 200 else "high"
                 ),
+                "has_functions": has_functions,
+                "has_classes": has_classes,
+                "has_comments": has_comments,
             }
 
-            # Simple code structure analysis
-            analysis["has_functions"] = any("def " in line for line in lines)
-            analysis["has_classes"] = any("class " in line for line in lines)
-            analysis["has_comments"] = any(line.strip().startswith("#") for line in lines)
-
-            return analysis
-
         except Exception as e:
             logger.error(f"❌ Error analyzing code file: {e}")
             return {"code_analysis_error": str(e)}
 
     def increment_download_count(self, file_id: str) -> bool:
         """Increment file download count"""
-        try:
-            self.file_repo.increment_download_count(file_id)
-            logger.debug(f"📥 Incremented download count for file {file_id}")
-            return True
-        except Exception as e:
-            logger.error(f"❌ Failed to increment download count: {e}")
+        if not self.file_repo.increment_download_count(file_id):
             return False
 
+        _FILE_CACHE.pop(file_id, None)  # cached download_count is now stale
+        return True
+
     def get_file_download_info(self, file_id: str) -> Dict[str, Any]:
         """Get file information for download"""
-        try:
-            file_record = self.get_file(file_id)
-            if not file_record:
-                return {"error": "File not found"}
-
-            return file_record.to_download_dict()
+        file_record = self.get_file(file_id)
+        if not file_record:
+            return {"error": "File not found"}
 
-        except Exception as e:
-            logger.error(f"❌ Failed to get file download info: {e}")
-            return {"error": str(e)}
+        return file_record.to_download_dict()
 
     def cleanup_orphaned_files(self, days_old: int = 30) -> int:
         """Clean up orphaned files (not linked to any project or ticket)"""
@@ -6,10 +6,69 @@ Handles gesture recognition from video input.
 This is a placeholder for the planned gesture recognition system.
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import itertools
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
 from config.settings import logger
 
+# Optional: OpenCV für Videoquellen (Kamera, Datei, Stream-URL)
+try:
+    import cv2
+
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+    cv2 = None
+
+# Unveränderliche Platzhalter-Antworten, von allen Aufrufen geteilt
+_GESTURE_PLACEHOLDER: Mapping[str, Any] = MappingProxyType(
+    {
+        "gestures_detected": (),
+        "hands_detected": 0,
+        "confidence": 0.0,
+        "status": "not_implemented",
+        "message": "Gesture detection not yet implemented",
+    }
+)
+_POSE_PLACEHOLDER: Mapping[str, Any] = MappingProxyType(
+    {
+        "pose_detected": False,
+        "keypoints": (),
+        "confidence": 0.0,
+        "status": "not_implemented",
+        "message": "Pose detection not yet implemented",
+    }
+)
+_HAND_TRACKING_PLACEHOLDER: Mapping[str, Any] = MappingProxyType(
+    {
+        "hands": (),
+        "tracking_active": False,
+        "status": "not_implemented",
+        "message": "Hand tracking not yet implemented",
+    }
+)
+
+
+@dataclass
+class TrackingState:
+    """Tracking-Zustand einer Session zwischen zwei Frames"""
+
+    last_landmarks: Optional[Any] = None
+    last_roi: Optional[Tuple[float, float, float, float]] = None
+    confidence: float = 0.0
+    frames_since_detect: int = 0
+
+    def reset(self) -> None:
+        """Verwirft Landmarks und ROI, der nächste Frame läuft durch den Detektor"""
+        self.last_landmarks = None
+        self.last_roi = None
+        self.confidence = 0.0
+        self.frames_since_detect = 0
+
 
 class GestureRecognitionService:
     """
@@ -35,12 +94,16 @@ class GestureRecognitionService:
         "clap",
     ]
 
-    def __init__(self):
+    def __init__(self, tracking_threshold: float = 0.5):
         self.model_loaded = False
+        # Unterhalb dieser Tracker-Konfidenz läuft der Hand-Detektor erneut
+        self.tracking_threshold = tracking_threshold
         self.custom_gestures: Dict[str, Dict[str, Any]] = {}
+        # Laufende Tracking-Sessions: Frame-Puffer (maxsize=1), Zustand, Consumer-Task
+        self._tracking_sessions: Dict[str, Dict[str, Any]] = {}
         logger.info("🎭 Gesture Recognition Service initialized (placeholder)")
 
-    async def detect_gesture(self, video_frame: bytes) -> Dict[str, Any]:
+    async def detect_gesture(self, video_frame: bytes) -> Mapping[str, Any]:
         """
         Erkennt Gesten aus Videobild
 
@@ -48,17 +111,55 @@ class GestureRecognitionService:
             video_frame: Videobild-Daten
 
         Returns:
-            Dict mit erkannten Gesten
+            Mapping mit erkannten Gesten (Platzhalter: geteilt und schreibgeschützt)
         """
-        return {
-            "gestures_detected": [],
-            "hands_detected": 0,
-            "confidence": 0.0,
-            "status": "not_implemented",
-            "message": "Gesture detection not yet implemented",
-        }
+        return _GESTURE_PLACEHOLDER
+
+    async def process_frame(self, video_frame: bytes, state: TrackingState) -> Mapping[str, Any]:
+        """
+        Verarbeitet ein Videobild einer laufenden Session (Tracker→Detektor-Kaskade)
+
+        Das leichte Landmark-Modell verfolgt die Hand in der ROI des Vorframes;
+        der teure Hand-Detektor läuft nur, wenn die Tracker-Konfidenz unter
+        ``tracking_threshold`` fällt oder noch keine ROI existiert.
+
+        Args:
+            video_frame: Videobild-Daten
+            state: Tracking-Zustand der Session, wird aktualisiert
+
+        Returns:
+            Mapping mit erkannten Gesten
+        """
+        landmarks = None
+        confidence = 0.0
+        if state.last_roi is not None and state.confidence >= self.tracking_threshold:
+            landmarks, confidence = self._track_landmarks(video_frame, state.last_roi)
+            state.frames_since_detect += 1
+
+        if confidence < self.tracking_threshold:
+            roi = self._detect_hand(video_frame)
+            if roi is None:
+                state.reset()
+                return _GESTURE_PLACEHOLDER
+            landmarks, confidence = self._track_landmarks(video_frame, roi)
+            state.last_roi = roi
+            state.frames_since_detect = 0
+
+        state.last_landmarks = landmarks
+        state.confidence = confidence
+        return _GESTURE_PLACEHOLDER
+
+    def _detect_hand(self, video_frame: bytes) -> Optional[Tuple[float, float, float, float]]:
+        """Hand-Detektor (schwer): liefert die ROI der Hand oder None (Platzhalter)"""
+        return None
 
-    async def detect_pose(self, video_frame: bytes) -> Dict[str, Any]:
+    def _track_landmarks(
+        self, video_frame: bytes, roi: Tuple[float, float, float, float]
+    ) -> Tuple[Optional[Any], float]:
+        """Landmark-Tracker (leicht): liefert Landmarks und Konfidenz in der ROI (Platzhalter)"""
+        return None, 0.0
+
+    async def detect_pose(self, video_frame: bytes) -> Mapping[str, Any]:
         """
         Erkennt Körperhaltung aus Videobild
 
@@ -66,17 +167,11 @@ class GestureRecognitionService:
             video_frame: Videobild-Daten
 
         Returns:
-            Dict mit Körperhaltungsdaten
+            Mapping mit Körperhaltungsdaten (Platzhalter: geteilt und schreibgeschützt)
         """
-        return {
-            "pose_detected": False,
-            "keypoints": [],
-            "confidence": 0.0,
-            "status": "not_implemented",
-            "message": "Pose detection not yet implemented",
-        }
+        return _POSE_PLACEHOLDER
 
-    async def track_hand(self, video_frame: bytes) -> Dict[str, Any]:
+    async def track_hand(self, video_frame: bytes) -> Mapping[str, Any]:
         """
         Trackt Hand-Position und -Bewegung
 
@@ -84,14 +179,9 @@ class GestureRecognitionService:
             video_frame: Videobild-Daten
 
         Returns:
-            Dict mit Hand-Tracking-Daten
+            Mapping mit Hand-Tracking-Daten (Platzhalter: geteilt und schreibgeschützt)
         """
-        return {
-            "hands": [],
-            "tracking_active": False,
-            "status": "not_implemented",
-            "message": "Hand tracking not yet implemented",
-        }
+        return _HAND_TRACKING_PLACEHOLDER
 
     async def register_custom_gesture(
         self, name: str, training_data: List[bytes]
@@ -114,18 +204,135 @@ class GestureRecognitionService:
         }
 
     async def start_continuous_tracking(
-        self, session_id: str, callback_url: Optional[str] = None
+        self,
+        session_id: str,
+        callback_url: Optional[str] = None,
+        video_source: Optional[Union[str, int]] = None,
+        target_fps: Optional[float] = None,
     ) -> Dict[str, Any]:
-        """Startet kontinuierliches Gesture-Tracking"""
+        """
+        Startet kontinuierliches Gesture-Tracking
+
+        Frames werden über ``submit_frame`` eingespeist; der Puffer hält nur
+        das neueste Bild, ältere werden verworfen statt Latenz aufzustauen.
+        Mit ``video_source`` liest OpenCV die Quelle selbst und dekodiert nur
+        so viele Bilder, wie ``target_fps`` verlangt.
+        """
+        if video_source is not None and not CV2_AVAILABLE:
+            logger.warning("⚠️ OpenCV not installed, video source tracking unavailable")
+            return {
+                "session_id": session_id,
+                "tracking_started": False,
+                "status": "unavailable",
+                "callback_url": callback_url,
+                "message": "OpenCV (cv2) is required for video source tracking",
+            }
+
+        if session_id not in self._tracking_sessions:
+            session: Dict[str, Any] = {
+                "frames": asyncio.Queue(maxsize=1),
+                "state": TrackingState(),
+                "callback_url": callback_url,
+                "last_result": None,
+                "dropped_frames": 0,
+            }
+            session["task"] = asyncio.create_task(self._consume_frames(session))
+            if video_source is not None:
+                session["capture_stop"] = threading.Event()
+                session["capture_task"] = asyncio.create_task(
+                    asyncio.to_thread(
+                        self._capture_frames,
+                        session_id,
+                        video_source,
+                        target_fps,
+                        asyncio.get_running_loop(),
+                        session["capture_stop"],
+                    )
+                )
+            self._tracking_sessions[session_id] = session
+
         return {
             "session_id": session_id,
-            "tracking_started": False,
-            "status": "not_implemented",
+            "tracking_started": True,
+            "status": "tracking",
             "callback_url": callback_url,
         }
 
+    def submit_frame(self, session_id: str, video_frame: Any) -> bool:
+        """Legt ein Videobild in den Session-Puffer, ein noch wartendes wird ersetzt"""
+        session = self._tracking_sessions.get(session_id)
+        if session is None:
+            return False
+
+        frames: "asyncio.Queue[Any]" = session["frames"]
+        try:
+            frames.put_nowait(video_frame)
+        except asyncio.QueueFull:
+            frames.get_nowait()
+            frames.put_nowait(video_frame)
+            session["dropped_frames"] += 1
+        return True
+
+    def _capture_frames(
+        self,
+        session_id: str,
+        video_source: Union[str, int],
+        target_fps: Optional[float],
+        loop: asyncio.AbstractEventLoop,
+        stop: threading.Event,
+    ) -> None:
+        """
+        Liest eine Videoquelle im Worker-Thread
+
+        ``grab()`` rückt ohne Dekodieren vor; ``retrieve()`` dekodiert nur jedes
+        n-te Bild. Die Schrittweite folgt aus der Bildrate der Quelle, so dass
+        Dateien und Streams (deren ``grab()`` nicht im Quelltakt blockiert) in
+        Medienzeit mit ``target_fps`` abgetastet werden.
+        """
+        cap = cv2.VideoCapture(video_source)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        source_fps = cap.get(cv2.CAP_PROP_FPS)
+        stride = max(1, round(source_fps / target_fps)) if target_fps and source_fps > 0 else 1
+        try:
+            for index in itertools.count():
+                if stop.is_set() or not cap.grab():
+                    break
+                if index % stride:
+                    continue
+                ok, frame = cap.retrieve()
+                if ok:
+                    loop.call_soon_threadsafe(self.submit_frame, session_id, frame)
+        finally:
+            cap.release()
+
+    async def _consume_frames(self, session: Dict[str, Any]) -> None:
+        """Consumer-Schleife einer Session: verarbeitet immer das neueste Bild"""
+        frames: "asyncio.Queue[Any]" = session["frames"]
+        while True:
+            video_frame = await frames.get()
+            try:
+                session["last_result"] = await self.process_frame(video_frame, session["state"])
+            except Exception as e:
+                logger.error(f"❌ Gesture tracking frame failed: {e}")
+
     async def stop_continuous_tracking(self, session_id: str) -> bool:
         """Stoppt kontinuierliches Gesture-Tracking"""
+        session = self._tracking_sessions.pop(session_id, None)
+        if session is None:
+            return False
+
+        task: "asyncio.Task[None]" = session["task"]
+        try:
+            if "capture_stop" in session:
+                # Der Capture-Thread beendet sich nach dem nächsten grab()
+                session["capture_stop"].set()
+                await session["capture_task"]
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
         return True
 
     def get_supported_gestures(self) -> List[str]:
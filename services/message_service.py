@@ -1,13 +1,142 @@
+import asyncio
 import json
 import os
+import random
+import re
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple, Union
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 
 from config.settings import enhanced_logger
 from database.models import Message, MessageType
 from database.repositories import MessageRepository
+from services.exceptions import ExternalServiceError
+
+# Fast JSON for Ollama payloads and replies (orjson returns bytes directly)
+_jdumps: Callable[[Any], bytes]
+_jloads: Callable[[Union[str, bytes]], Any]
+try:
+    import orjson
+
+    _jdumps = orjson.dumps
+    _jloads = orjson.loads
+except ImportError:
+
+    def _json_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _jdumps = _json_bytes
+    _jloads = json.loads
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Number of earlier chat messages included in a prompt
+_CONTEXT_WINDOW = 10
+
+# Chat prompts; the shared system line stays a fixed prefix for Ollama's prompt cache
+_CHAT_SYSTEM_PROMPT = "Du bist ein hilfreicher Chat-Assistent. Antworte kurz und freundlich.\n\n"
+_CHAT_PROMPT_WITH_CONTEXT = (
+    _CHAT_SYSTEM_PROMPT + "Chat-Verlauf:\n{context}\n\nBenutzer: {message}\nAssistant:"
+)
+_CHAT_PROMPT = _CHAT_SYSTEM_PROMPT + "Benutzer: {message}\nAssistant:"
+
+# Sentiment prompts for a single message and for a microbatch of messages
+_SENTIMENT_PROMPT = """Analysiere die Stimmung dieser Nachricht und antworte nur mit JSON:
+
+Nachricht: "{message}"
+
+Antworte im Format: {{"sentiment": "positive|neutral|negative", "confidence": 0.95, "keywords": ["wort1", "wort2"]}}"""
+_SENTIMENT_BATCH_PROMPT = """Analysiere die Stimmung jeder Nachricht in diesem JSON-Array und antworte nur mit JSON:
+
+{messages}
+
+Antworte im Format: {{"results": [{{"id": 0, "sentiment": "positive|neutral|negative", "confidence": 0.95, "keywords": ["wort1", "wort2"]}}]}} mit einem Eintrag je Nachricht-ID."""
+
+# Canned replies of the simulated custom model when no keyword matches
+_CUSTOM_MODEL_DEFAULT_RESPONSES = (
+    "Das ist eine interessante Frage!",
+    "Ich verstehe, was du meinst.",
+    "Könntest du das näher erläutern?",
+    "Danke für deine Nachricht!",
+    "Das klingt spannend!",
+)
+
+# Keyword -> reply of the simulated custom model; earlier keywords win
+_CUSTOM_MODEL_KEYWORD_RESPONSES = (
+    ("hallo", "Hallo! Wie kann ich dir helfen?"),
+    ("wie geht", "Mir geht es gut, danke der Nachfrage! Und dir?"),
+    ("danke", "Gern geschehen! 😊"),
+    ("was kannst", "Ich kann mit dir chatten und Fragen beantworten."),
+    ("hilf", "Natürlich helfe ich gerne! Was möchtest du wissen?"),
+)
+_CUSTOM_MODEL_KEYWORDS = tuple(keyword for keyword, _ in _CUSTOM_MODEL_KEYWORD_RESPONSES)
+_CUSTOM_MODEL_KEYWORD_INDEX = {keyword: i for i, keyword in enumerate(_CUSTOM_MODEL_KEYWORDS)}
+# One scan finds the leftmost keyword; only keywords listed before it need a recheck
+_CUSTOM_MODEL_KEYWORD_RE = re.compile("|".join(map(re.escape, _CUSTOM_MODEL_KEYWORDS)))
+
+# Echo templates used when no AI backend is available
+_FALLBACK_TEMPLATES = (
+    "Ich habe deine Nachricht erhalten: '{}'",
+    "Danke für deine Nachricht: '{}'",
+    "Verstanden: '{}'",
+    "Notiert: '{}'",
+)
+
+
+def _build_http_session() -> requests.Session:
+    """Keep-alive session for the health and model-list probes.
+
+    No retries: the probes run synchronously (also from __init__), so an
+    unreachable Ollama has to fail fast instead of blocking the event loop.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by all MessageService instances (routes create one per module/request)
+_http_session = _build_http_session()
+
+
+def _build_async_http_client() -> httpx.AsyncClient:
+    """Non-blocking client for generation calls; failed connects are retried"""
+    return httpx.AsyncClient(
+        timeout=30,
+        transport=httpx.AsyncHTTPTransport(retries=2, limits=httpx.Limits(max_connections=32)),
+    )
+
+
+# Opens no connections until first use; closed on app shutdown
+_async_http_client = _build_async_http_client()
+
+
+def _get_async_http_client() -> httpx.AsyncClient:
+    """Shared generation client, rebuilt if a previous app shutdown closed it"""
+    global _async_http_client
+
+    if _async_http_client.is_closed:
+        _async_http_client = _build_async_http_client()
+    return _async_http_client
+
+
+async def close_async_http_client() -> None:
+    """Close the pooled connections of the shared generation client"""
+    await _async_http_client.aclose()
+
+
+# Sentiment requests arriving together share one Ollama call. The queue lives at
+# module level because get_message_service() builds a new service per call.
+_SENTIMENT_BATCH_SIZE = 8
+_SENTIMENT_BATCH_WAIT = 0.05  # seconds
+_pending_sentiment: List[Tuple[str, "asyncio.Future[Optional[Dict[str, Any]]]"]] = []
+_sentiment_timer: Optional["asyncio.Task[None]"] = None
+_sentiment_batches: Set["asyncio.Task[None]"] = set()  # keeps running batches referenced
 
 
 class MessageService:
@@ -18,12 +147,17 @@ class MessageService:
 
     def __init__(self, repository: MessageRepository):
         self.repository = repository
+        self._rng = random.Random()  # Canned response selection
 
         # AI Configuration
         self.ollama_base_url = "http://localhost:11434"
         self.ollama_available = self._check_ollama_connection()
         self.custom_model_available = self._check_custom_model()
 
+        # (monotonic fetch time, models) of the last get_available_models call
+        self._models_cache: Optional[Tuple[float, Dict[str, List[str]]]] = None
+        self.models_cache_ttl = 30.0  # seconds
+
         enhanced_logger.info(
             "MessageService initialized",
             ollama_available=self.ollama_available,
@@ -33,7 +167,7 @@ class MessageService:
     def _check_ollama_connection(self) -> bool:
         """Check if Ollama is running and available"""
         try:
-            response = requests.get(f"{self.ollama_base_url}/api/tags", timeout=5)
+            response = _http_session.get(f"{self.ollama_base_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 enhanced_logger.info("Ollama connection established")
                 return True
@@ -57,14 +191,19 @@ class MessageService:
     # ============================================================================
 
     def get_available_models(self) -> Dict[str, List[str]]:
-        """Get list of available AI models"""
+        """Get list of available AI models (cached for models_cache_ttl seconds)"""
+        if self._models_cache is not None:
+            fetched_at, models = self._models_cache
+            if time.monotonic() - fetched_at < self.models_cache_ttl:
+                return {kind: list(names) for kind, names in models.items()}
+
         models = {"ollama": [], "custom": []}
 
         if self.ollama_available:
             try:
-                response = requests.get(f"{self.ollama_base_url}/api/tags", timeout=5)
+                response = _http_session.get(f"{self.ollama_base_url}/api/tags", timeout=5)
                 if response.status_code == 200:
-                    models_data = response.json()
+                    models_data = _jloads(response.content)
                     models["ollama"] = [model["name"] for model in models_data.get("models", [])]
                     enhanced_logger.debug("Ollama models fetched", count=len(models["ollama"]))
             except Exception as e:
@@ -78,13 +217,22 @@ class MessageService:
             ollama_models=len(models["ollama"]),
             custom_models=len(models["custom"]),
         )
+        self._models_cache = (
+            time.monotonic(),
+            {kind: list(names) for kind, names in models.items()},
+        )
         return models
 
+    def refresh_models(self) -> Dict[str, List[str]]:
+        """Drop the cached model list and fetch it again"""
+        self._models_cache = None
+        return self.get_available_models()
+
     # ============================================================================
     # AI Response Generation
     # ============================================================================
 
-    def generate_ai_response(
+    async def generate_ai_response(
         self,
         message: str,
         context_messages: Optional[List[Message]] = None,
@@ -97,17 +245,10 @@ class MessageService:
             return "Bitte gib eine Nachricht ein."
 
         try:
-            context = ""
-            if context_messages:
-                context = "\n".join(
-                    [
-                        f"{msg.username}: {msg.message}"
-                        for msg in context_messages[-10:]  # Last 10 messages for context
-                    ]
-                )
+            context = self._build_context(context_messages)
 
             if model_type == "ollama" and self.ollama_available:
-                return self._generate_with_ollama(message, context, model_name)
+                return await self._generate_with_ollama(message, context, model_name)
             elif model_type == "custom" and self.custom_model_available:
                 return self._generate_with_custom_model(message, context)
             else:
@@ -119,7 +260,86 @@ class MessageService:
             )
             return "Es ist ein Fehler bei der Antwort-Generierung aufgetreten."
 
-    def _generate_with_ollama(self, message: str, context: str, model_name: str) -> str:
+    async def stream_ai_response(
+        self,
+        message: str,
+        context_messages: Optional[List[Message]] = None,
+        model_type: str = "ollama",
+        model_name: str = "llama2",
+    ) -> AsyncIterator[str]:
+        """Yield the AI response in pieces as Ollama generates it
+
+        Other model types have no streaming API and yield their full response once.
+        """
+        if model_type != "ollama" or not self.ollama_available or not message.strip():
+            yield await self.generate_ai_response(
+                message, context_messages, model_type=model_type, model_name=model_name
+            )
+            return
+
+        async for token in self._stream_with_ollama(
+            message, self._build_context(context_messages), model_name
+        ):
+            yield token
+
+    def _build_context(self, context_messages: Optional[List[Message]]) -> str:
+        """Format the last chat messages as prompt context"""
+        if not context_messages:
+            return ""
+        # Last messages for context; callers usually pass no more, so skip the slice copy
+        if len(context_messages) > _CONTEXT_WINDOW:
+            context_messages = context_messages[-_CONTEXT_WINDOW:]
+        # join() materialises its input anyway, so a list comprehension beats a generator
+        return "\n".join([f"{msg.username}: {msg.message}" for msg in context_messages])
+
+    async def _stream_with_ollama(
+        self, message: str, context: str, model_name: str
+    ) -> AsyncIterator[str]:
+        """Stream response tokens from Ollama's NDJSON generate endpoint
+
+        Raises ExternalServiceError if the stream breaks after tokens were sent,
+        so the partial answer is not mistaken for a complete one.
+        """
+        payload = {
+            "model": model_name,
+            "prompt": self._build_prompt(message, context),
+            "stream": True,
+            "options": {"temperature": 0.7, "top_p": 0.9, "max_tokens": 500},
+        }
+        streamed = False
+        try:
+            async with _get_async_http_client().stream(
+                "POST",
+                f"{self.ollama_base_url}/api/generate",
+                content=_jdumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=30,
+            ) as response:
+                if response.status_code != 200:
+                    enhanced_logger.error(
+                        "Ollama API error", status_code=response.status_code, model=model_name
+                    )
+                    yield "Ollama konnte keine Antwort generieren."
+                    return
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = _jloads(line)
+                    token = chunk.get("response")
+                    if token:
+                        streamed = True
+                        yield token
+                    if chunk.get("done"):
+                        break
+
+        except Exception as e:
+            enhanced_logger.error("Error with Ollama streaming", error=str(e), model=model_name)
+            if streamed:
+                raise ExternalServiceError("Ollama", "Ollama stream interrupted") from e
+            yield "Verbindung zu Ollama fehlgeschlagen."
+
+    async def _generate_with_ollama(self, message: str, context: str, model_name: str) -> str:
         """Generate response using Ollama"""
         try:
             prompt = self._build_prompt(message, context)
@@ -135,12 +355,15 @@ class MessageService:
                 "Sending request to Ollama", model=model_name, prompt_length=len(prompt)
             )
 
-            response = requests.post(
-                f"{self.ollama_base_url}/api/generate", json=payload, timeout=30
+            response = await _get_async_http_client().post(
+                f"{self.ollama_base_url}/api/generate",
+                content=_jdumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=30,
             )
 
             if response.status_code == 200:
-                result = response.json()
+                result = _jloads(response.content)
                 ai_response = result.get("response", "").strip()
                 enhanced_logger.info(
                     "Ollama response generated", model=model_name, response_length=len(ai_response)
@@ -162,33 +385,18 @@ class MessageService:
             # Note: _build_prompt() method available for future model integration
 
             # Simulated responses for demonstration
-            responses = {
-                "hallo": "Hallo! Wie kann ich dir helfen?",
-                "wie geht": "Mir geht es gut, danke der Nachfrage! Und dir?",
-                "danke": "Gern geschehen! 😊",
-                "was kannst": "Ich kann mit dir chatten und Fragen beantworten.",
-                "hilf": "Natürlich helfe ich gerne! Was möchtest du wissen?",
-            }
-
             message_lower = message.lower()
-            for key, response in responses.items():
-                if key in message_lower:
-                    enhanced_logger.info(
-                        "Custom model response generated", response_type="simulated"
-                    )
-                    return response
-
-            import random
-
-            default_responses = [
-                "Das ist eine interessante Frage!",
-                "Ich verstehe, was du meinst.",
-                "Könntest du das näher erläutern?",
-                "Danke für deine Nachricht!",
-                "Das klingt spannend!",
-            ]
-
-            response = random.choice(default_responses)
+            match = _CUSTOM_MODEL_KEYWORD_RE.search(message_lower)
+            if match:
+                index = _CUSTOM_MODEL_KEYWORD_INDEX[match.group()]
+                for earlier in range(index):
+                    if _CUSTOM_MODEL_KEYWORDS[earlier] in message_lower:
+                        index = earlier
+                        break
+                enhanced_logger.info("Custom model response generated", response_type="simulated")
+                return _CUSTOM_MODEL_KEYWORD_RESPONSES[index][1]
+
+            response = self._rng.choice(_CUSTOM_MODEL_DEFAULT_RESPONSES)
             enhanced_logger.info("Custom model response generated", response_type="fallback")
             return response
 
@@ -199,38 +407,19 @@ class MessageService:
     def _build_prompt(self, message: str, context: str) -> str:
         """Build prompt for AI model"""
         if context:
-            return f"""Du bist ein hilfreicher Chat-Assistent. Antworte kurz und freundlich.
-
-Chat-Verlauf:
-{context}
-
-Benutzer: {message}
-Assistant:"""
-        else:
-            return f"""Du bist ein hilfreicher Chat-Assistent. Antworte kurz und freundlich.
-
-Benutzer: {message}
-Assistant:"""
+            return _CHAT_PROMPT_WITH_CONTEXT.format(context=context, message=message)
+        return _CHAT_PROMPT.format(message=message)
 
     def _generate_fallback_response(self, message: str) -> str:
         """Generate fallback response when no AI is available"""
-        import random
-
-        fallback_responses = [
-            "Ich habe deine Nachricht erhalten: '{}'",
-            "Danke für deine Nachricht: '{}'",
-            "Verstanden: '{}'",
-            "Notiert: '{}'",
-        ]
-
-        response_template = random.choice(fallback_responses)
+        response_template = self._rng.choice(_FALLBACK_TEMPLATES)
         return response_template.format(message)
 
     # ============================================================================
     # Message Management with AI Integration
     # ============================================================================
 
-    def save_message_with_ai_response(
+    async def save_message_with_ai_response(
         self, message: Message, use_ai: bool = True
     ) -> Dict[str, Any]:
         """Save user message and optionally generate AI response"""
@@ -241,7 +430,7 @@ Assistant:"""
             if use_ai and (self.ollama_available or self.custom_model_available):
                 context_messages = self.get_recent_messages(5)
 
-                ai_response_text = self.generate_ai_response(
+                ai_response_text = await self.generate_ai_response(
                     message=message.message,
                     context_messages=context_messages,
                     model_type="ollama" if self.ollama_available else "custom",
@@ -280,7 +469,7 @@ Assistant:"""
                 "error": str(e),
             }
 
-    def ask_question(
+    async def ask_question(
         self,
         question: str,
         username: str,
@@ -306,7 +495,7 @@ Assistant:"""
             if use_context:
                 context_messages = self.get_recent_messages(10)
 
-            ai_response = self.generate_ai_response(
+            ai_response = await self.generate_ai_response(
                 message=question, context_messages=context_messages, model_type=model_type
             )
 
@@ -355,7 +544,7 @@ Assistant:"""
     # AI Analysis Features
     # ============================================================================
 
-    def analyze_message_sentiment(self, message: str) -> Dict[str, Any]:
+    async def analyze_message_sentiment(self, message: str) -> Dict[str, Any]:
         """Analyze sentiment of a message using AI"""
         if not (self.ollama_available or self.custom_model_available):
             return {
@@ -366,34 +555,15 @@ Assistant:"""
             }
 
         try:
-            prompt = f"""Analysiere die Stimmung dieser Nachricht und antworte nur mit JSON:
-
-Nachricht: "{message}"
-
-Antworte im Format: {{"sentiment": "positive|neutral|negative", "confidence": 0.95, "keywords": ["wort1", "wort2"]}}"""
-
             if self.ollama_available:
-                payload = {"model": "llama2", "prompt": prompt, "stream": False, "format": "json"}
-
-                response = requests.post(
-                    f"{self.ollama_base_url}/api/generate", json=payload, timeout=20
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    response_text = result.get("response", "{}")
-                    try:
-                        sentiment_data = json.loads(response_text)
-                        sentiment_data["ai_available"] = True
-                        sentiment_data["analysis_method"] = "ollama"
-                        enhanced_logger.info(
-                            "Sentiment analysis completed",
-                            sentiment=sentiment_data.get("sentiment"),
-                            confidence=sentiment_data.get("confidence"),
-                        )
-                        return sentiment_data
-                    except json.JSONDecodeError:
-                        enhanced_logger.warning("Invalid JSON response from AI sentiment analysis")
+                sentiment_data = await self._queue_sentiment(message)
+                if sentiment_data is not None:
+                    enhanced_logger.info(
+                        "Sentiment analysis completed",
+                        sentiment=sentiment_data.get("sentiment"),
+                        confidence=sentiment_data.get("confidence"),
+                    )
+                    return sentiment_data
 
             # Fallback analysis
             return {
@@ -416,6 +586,121 @@ Antworte im Format: {{"sentiment": "positive|neutral|negative", "confidence": 0.
                 "error": str(e),
             }
 
+    async def _queue_sentiment(self, message: str) -> Optional[Dict[str, Any]]:
+        """Add a message to the next sentiment batch and wait for its result"""
+        global _sentiment_timer
+
+        future: "asyncio.Future[Optional[Dict[str, Any]]]"
+        future = asyncio.get_running_loop().create_future()
+        _pending_sentiment.append((message, future))
+
+        if len(_pending_sentiment) >= _SENTIMENT_BATCH_SIZE:
+            self._start_sentiment_batch()
+        elif _sentiment_timer is None:
+            _sentiment_timer = asyncio.create_task(self._run_sentiment_batch_after_wait())
+
+        # The batch runs in its own task, so a cancelled caller leaves it running
+        return await asyncio.shield(future)
+
+    async def _run_sentiment_batch_after_wait(self) -> None:
+        global _sentiment_timer
+
+        await asyncio.sleep(_SENTIMENT_BATCH_WAIT)
+        _sentiment_timer = None
+        self._start_sentiment_batch()
+
+    def _start_sentiment_batch(self) -> None:
+        """Hand all waiting sentiment requests to a new batch task"""
+        global _sentiment_timer
+
+        if _sentiment_timer is not None:
+            _sentiment_timer.cancel()
+            _sentiment_timer = None
+
+        batch = _pending_sentiment[:]
+        _pending_sentiment.clear()
+        if batch:
+            task = asyncio.create_task(self._run_sentiment_batch(batch))
+            _sentiment_batches.add(task)
+            task.add_done_callback(_sentiment_batches.discard)
+
+    async def _run_sentiment_batch(self, batch: List[Tuple[str, "asyncio.Future[Any]"]]) -> None:
+        """Send one batch of sentiment requests to Ollama in one call"""
+        try:
+            results = await self._ollama_sentiment_batch([message for message, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # Never leave a waiter hanging, even if the batch task was cancelled
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(
+                        ExternalServiceError("Ollama", "Sentiment batch did not complete")
+                    )
+
+    async def _ollama_sentiment_batch(self, messages: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Sentiment for each message via one Ollama call; None where no usable answer came back"""
+        if len(messages) == 1:
+            prompt = _SENTIMENT_PROMPT.format(message=messages[0])
+        else:
+            # JSON-encoded so quotes or newlines in one user's text cannot forge another entry
+            numbered = json.dumps(
+                [{"id": i, "text": message} for i, message in enumerate(messages)],
+                ensure_ascii=False,
+            )
+            prompt = _SENTIMENT_BATCH_PROMPT.format(messages=numbered)
+
+        payload = {"model": "llama2", "prompt": prompt, "stream": False, "format": "json"}
+        response = await _get_async_http_client().post(
+            f"{self.ollama_base_url}/api/generate",
+            content=_jdumps(payload),
+            headers=_JSON_HEADERS,
+            timeout=20,
+        )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        if response.status_code != 200:
+            return results
+
+        response_text = _jloads(response.content).get("response", "{}")
+        try:
+            data = _jloads(response_text)
+        except json.JSONDecodeError:
+            enhanced_logger.warning("Invalid JSON response from AI sentiment analysis")
+            return results
+
+        entries = {0: data} if len(messages) == 1 else self._sentiment_batch_entries(data)
+
+        for i, entry in entries.items():
+            if 0 <= i < len(messages) and isinstance(entry, dict):
+                entry["ai_available"] = True
+                entry["analysis_method"] = "ollama"
+                results[i] = entry
+        return results
+
+    @staticmethod
+    def _sentiment_batch_entries(data: Any) -> Dict[int, Any]:
+        """Batch answer entries by message id; ids answered more than once are dropped"""
+        entries: Dict[int, Any] = {}
+        duplicates = set()
+        for entry in data.get("results", []) if isinstance(data, dict) else []:
+            if not isinstance(entry, dict) or not isinstance(entry.get("id"), int):
+                continue
+            i = entry.pop("id")
+            if i in entries:
+                duplicates.add(i)
+            entries[i] = entry
+
+        # An ambiguous id falls back to keyword analysis for that message
+        for i in duplicates:
+            del entries[i]
+        return entries
+
     # ============================================================================
     # Core Message Operations (Delegated to Repository)
     # ============================================================================
@@ -507,10 +792,7 @@ Antworte im Format: {{"sentiment": "positive|neutral|negative", "confidence": 0.
                 enhanced_logger.warning("Empty username provided for user messages query")
                 return []
 
-            all_messages = self.get_all_messages()
-            user_messages = [msg for msg in all_messages if msg.username == username]
-
-            user_messages = user_messages[:limit]
+            user_messages = self.repository.get_messages_by_username(username, limit)
 
             enhanced_logger.info(
                 "User messages retrieved", username=username, count=len(user_messages)
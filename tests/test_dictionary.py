@@ -13,10 +13,9 @@ def dictionary_service():
     return DictionaryService()
 
 
-@pytest.mark.asyncio
-async def test_add_term(dictionary_service):
+def test_add_term(dictionary_service):
     """Test adding a term to dictionary"""
-    result = await dictionary_service.add_term(
+    result = dictionary_service.add_term(
         term="API",
         definition="Application Programming Interface",
         category="technology",
@@ -32,65 +31,121 @@ async def test_add_term(dictionary_service):
     assert "status" in result
 
 
-@pytest.mark.asyncio
-async def test_lookup_term(dictionary_service):
+def test_lookup_term(dictionary_service):
     """Test looking up a term"""
     # First add a term
-    await dictionary_service.add_term(term="FastAPI", definition="Modern Python web framework")
+    dictionary_service.add_term(term="FastAPI", definition="Modern Python web framework")
 
     # Lookup the term
-    result = await dictionary_service.lookup("FastAPI")
+    result = dictionary_service.lookup("FastAPI")
 
     assert result is not None
     assert result["term"] == "FastAPI"
     assert "definition" in result
 
 
-@pytest.mark.asyncio
-async def test_lookup_nonexistent_term(dictionary_service):
+def test_lookup_nonexistent_term(dictionary_service):
     """Test looking up a term that doesn't exist"""
-    result = await dictionary_service.lookup("NonexistentTerm")
+    result = dictionary_service.lookup("NonexistentTerm")
 
     assert result is None
 
 
-@pytest.mark.asyncio
-async def test_suggest_terms(dictionary_service):
+def test_lookup_after_update_and_delete(dictionary_service):
+    """Test that lookup follows renamed and deleted terms"""
+    entry = dictionary_service.add_term("Flask", "Micro web framework")
+
+    dictionary_service.update_term(entry["id"], {"term": "Quart"})
+    assert dictionary_service.lookup("flask") is None
+    assert (dictionary_service.lookup("QUART"))["id"] == entry["id"]
+
+    dictionary_service.delete_term(entry["id"])
+    assert dictionary_service.lookup("Quart") is None
+
+
+def test_lookup_falls_back_to_duplicate_spelling(dictionary_service):
+    """Test that deleting a term hands its lowercase spelling to a duplicate"""
+    first = dictionary_service.add_term("API", "Application Programming Interface")
+    second = dictionary_service.add_term("api", "Lowercase duplicate")
+
+    assert dictionary_service.lookup("Api")["id"] == first["id"]
+
+    dictionary_service.delete_term(first["id"])
+    assert dictionary_service.lookup("Api")["id"] == second["id"]
+
+    dictionary_service.delete_term(second["id"])
+    assert dictionary_service.lookup("Api") is None
+    assert "api" not in dictionary_service.terms_by_lower
+
+
+def test_delete_term_cleans_indexes(dictionary_service):
+    """Test that deleting a term removes its category and synonym entries"""
+    entry = dictionary_service.add_term(
+        "Redis", "In-memory store", category="database", synonyms=["KV-Store"]
+    )
+
+    assert dictionary_service.delete_term(entry["id"])
+    assert dictionary_service.get_terms_by_category("database") == []
+    assert dictionary_service.get_all_categories() == []
+    assert dictionary_service.lookup("kv-store") is None
+    assert dictionary_service.suggest("kv") == []
+
+
+def test_suggest_terms(dictionary_service):
     """Test term auto-completion"""
     # Add some terms
-    await dictionary_service.add_term("Python", "Programming language")
-    await dictionary_service.add_term("PyTest", "Testing framework")
-    await dictionary_service.add_term("Pydantic", "Data validation")
+    dictionary_service.add_term("Python", "Programming language")
+    dictionary_service.add_term("PyTest", "Testing framework")
+    dictionary_service.add_term("Pydantic", "Data validation")
 
     # Get suggestions
-    suggestions = await dictionary_service.suggest("Py", limit=5)
+    suggestions = dictionary_service.suggest("Py", limit=5)
 
     assert len(suggestions) >= 2
     assert all(s.lower().startswith("py") for s in suggestions)
 
 
-@pytest.mark.asyncio
-async def test_search_terms(dictionary_service):
+def test_search_terms(dictionary_service):
     """Test searching for terms"""
     # Add terms
-    await dictionary_service.add_term("Docker", "Container platform", category="devops")
-    await dictionary_service.add_term("Kubernetes", "Container orchestration", category="devops")
+    dictionary_service.add_term("Docker", "Container platform", category="devops")
+    dictionary_service.add_term("Kubernetes", "Container orchestration", category="devops")
 
     # Search by query
-    results = await dictionary_service.search_terms("container")
+    results = dictionary_service.search_terms("container")
 
     assert len(results) >= 2
     assert any("Docker" in r["term"] for r in results)
 
 
-@pytest.mark.asyncio
-async def test_get_statistics(dictionary_service):
+def test_search_ranks_exact_match_first(dictionary_service):
+    """Test that an exact term match leads the search results without duplicates"""
+    dictionary_service.add_term("Cache Layer", "Sits in front of the cache")
+    dictionary_service.add_term("Cache", "Fast storage")
+
+    results = dictionary_service.search_terms("cache")
+
+    assert [r["term"] for r in results] == ["Cache", "Cache Layer"]
+    assert [r["term"] for r in dictionary_service.search_terms("cache", limit=1)] == ["Cache"]
+
+
+def test_search_empty_query(dictionary_service):
+    """Test that an empty query never fails and lists every term like any substring"""
+    assert dictionary_service.search_terms("") == []
+
+    dictionary_service.add_term("Docker", "Container platform")
+    dictionary_service.add_term("Kubernetes", "Container orchestration")
+
+    assert [r["term"] for r in dictionary_service.search_terms("")] == ["Docker", "Kubernetes"]
+
+
+def test_get_statistics(dictionary_service):
     """Test getting dictionary statistics"""
     # Add some terms
-    await dictionary_service.add_term("Term1", "Definition1", category="cat1")
-    await dictionary_service.add_term("Term2", "Definition2", category="cat2")
+    dictionary_service.add_term("Term1", "Definition1", category="cat1")
+    dictionary_service.add_term("Term2", "Definition2", category="cat2")
 
-    stats = await dictionary_service.get_statistics()
+    stats = dictionary_service.get_statistics()
 
     assert "total_terms" in stats
     assert stats["total_terms"] >= 2
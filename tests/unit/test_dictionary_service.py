@@ -10,17 +10,15 @@ class TestDictionaryService:
     def service(self):
         return DictionaryService()
 
-    @pytest.mark.asyncio
-    async def test_add_term(self, service):
-        result = await service.add_term(
+    def test_add_term(self, service):
+        result = service.add_term(
             term="API", definition="Application Programming Interface", category="tech"
         )
         assert result is not None
         assert "term" in result
         assert result["term"] == "API"
 
-    @pytest.mark.asyncio
-    async def test_search_term(self, service):
-        await service.add_term("API", "Application Programming Interface")
-        results = await service.search_terms("API")
+    def test_search_term(self, service):
+        service.add_term("API", "Application Programming Interface")
+        results = service.search_terms("API")
         assert len(results) > 0
@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 import pytest
 
-from services.elyza_service import ElyzaService
+from services.elyza_service import ElyzaService, Language, SentimentType
 
 
 class TestElyzaService:
@@ -40,3 +40,122 @@ class TestElyzaService:
         assert len(service.get_context(user_id)) == 1
         service.clear_context(user_id)
         assert len(service.get_context(user_id)) == 0
+
+    @pytest.mark.asyncio
+    async def test_context_is_bounded(self, service):
+        user_id = "bounded_user"
+        for i in range(service.max_context_size + 3):
+            await service.generate_response(f"message {i}", user_id=user_id)
+        context = service.get_context(user_id)
+        assert len(context) == service.max_context_size
+        assert context[0] == "message 3"
+        assert context[-1] == f"message {service.max_context_size + 2}"
+
+    @pytest.mark.asyncio
+    async def test_custom_pattern_matching(self, service):
+        service.add_custom_pattern(r"\bpizza\b", {Language.ENGLISH: ["Pizza time!"]})
+        result = await service.generate_response("I want PIZZA", language=Language.ENGLISH)
+        assert result["stage"] == "classical_eliza"
+        assert result["response"] == "Pizza time!"
+
+    @pytest.mark.asyncio
+    async def test_pattern_order_wins_over_position(self, service):
+        # Patterns are tried in list order, not by position in the prompt
+        service.add_custom_pattern(r"\bzzfirst\b", {Language.ENGLISH: ["first"]})
+        service.add_custom_pattern(r"\bzzsecond\b", {Language.ENGLISH: ["second"]})
+        result = await service.generate_response("zzsecond zzfirst", language=Language.ENGLISH)
+        assert result["response"] == "first"
+
+    @pytest.mark.asyncio
+    async def test_custom_pattern_with_backreference(self, service):
+        # Numbered backreferences must keep matching their own group
+        service.add_custom_pattern(r"\b(\w+) \1\b", {Language.ENGLISH: ["echo"]})
+        result = await service.generate_response("zz zz", language=Language.ENGLISH)
+        assert result["response"] == "echo"
+        assert service._find_first_pattern_index("zz yy") is None
+
+    def test_sentiment_question_words_are_whole_words(self, service):
+        # "how" inside "show" must not count as a question
+        assert service._detect_sentiment("Show me the error") == SentimentType.NEGATIVE
+        assert service._detect_sentiment("Gutes Ergebnis, danke") == SentimentType.POSITIVE
+
+    def test_batch_detect(self, service):
+        prompts = ["What is the time?", "Das ist toll!", "What is the time?"]
+        results = service.batch_detect(prompts)
+        assert results == [
+            (Language.ENGLISH, SentimentType.QUESTION),
+            (Language.GERMAN, SentimentType.POSITIVE),
+            (Language.ENGLISH, SentimentType.QUESTION),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_custom_pattern_applies_to_seen_prompt(self, service):
+        # The cached match for a prompt must not outlive a pattern change
+        prompt = "zzcached prompt"
+        first = await service.generate_response(prompt, language=Language.ENGLISH)
+        assert first["stage"] != "classical_eliza"
+        service.add_custom_pattern(r"\bzzcached\b", {Language.ENGLISH: ["cached"]})
+        second = await service.generate_response(prompt, language=Language.ENGLISH)
+        assert second["response"] == "cached"
+
+    @pytest.mark.asyncio
+    async def test_matching_ignores_case(self, service):
+        assert service._detect_language("WHAT ARE YOU DOING") == Language.ENGLISH
+        assert service._detect_sentiment("DAS IST TOLL") == SentimentType.POSITIVE
+        result = await service.generate_response("HALLO", language=Language.GERMAN)
+        assert result["stage"] == "classical_eliza"
+
+    def test_language_words_next_to_punctuation(self, service):
+        # Indicator words count even when followed by punctuation
+        assert service._detect_language("Why? How? What?") == Language.ENGLISH
+        assert service._detect_language("Warum? Wie? Was?") == Language.GERMAN
+
+    @pytest.mark.asyncio
+    async def test_rag_stage_uses_injected_provider(self, service):
+        class FakeResult:
+            def __init__(self, content):
+                self.document = type("Doc", (), {"content": content})()
+
+        class FakeProvider:
+            async def query(self, prompt, top_k=3):
+                return [FakeResult("ELIZA was written by Joseph Weizenbaum")]
+
+        assert await service._try_rag_knowledge("x", Language.ENGLISH, None, None) is None
+        service.set_rag_provider(FakeProvider())
+        response = await service._try_rag_knowledge("x", Language.ENGLISH, None, None)
+        assert "Weizenbaum" in response
+
+    @pytest.mark.asyncio
+    async def test_stage_usage_stats(self, service):
+        await service.generate_response("Hallo", language=Language.GERMAN)
+        await service.generate_response("Das ist toll", language=Language.GERMAN)
+        stats = service.get_stats()
+        assert stats["total_requests"] == 2
+        assert stats["stage_usage"]["classical_eliza"] == 1
+        assert stats["stage_usage"]["text_analysis"] == 1
+        assert service.stats["total_requests"] == 2
+
+    def test_sentiment_counts_distinct_words(self, service):
+        # Repeating a word does not outweigh two different words
+        assert service._detect_sentiment("bad bad bad, but great and thanks") == (
+            SentimentType.POSITIVE
+        )
+        assert service._detect_sentiment("good but wrong") == SentimentType.NEUTRAL
+
+    def test_status_counts_follow_custom_patterns(self, service):
+        before = service.get_status()
+        service.add_custom_pattern(r"\bzzstatus\b", {Language.ENGLISH: ["ok"]})
+        after = service.get_status()
+        assert after["pattern_count_en"] == before["pattern_count_en"] + 1
+        assert after["pattern_count_de"] == before["pattern_count_de"]
+
+    @pytest.mark.asyncio
+    async def test_disabled_service_response(self):
+        with patch.dict(os.environ, {"ENABLE_ELYZA_FALLBACK": "false"}):
+            service = ElyzaService()
+        first = await service.generate_response("Hallo")
+        first["response"] = "changed"
+        second = await service.generate_response("Hallo")
+        assert second["error"] == "Service disabled"
+        assert second["response"] == "AI-Service ist momentan nicht verfügbar."
+        assert service.get_stats()["total_requests"] == 0
@@ -0,0 +1,77 @@
+"""Unit tests for EmotionDetectionService."""
+
+import asyncio
+
+import pytest
+
+from services.emotion_detection import EmotionDetectionService
+
+
+def make_service(**kwargs):
+    service = EmotionDetectionService(**kwargs)
+    service.model_loaded = True  # cache only applies once a model is loaded
+    return service
+
+
+class TestEmotionDetectionService:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "mode, hits, size",
+        [("on", 1, 1), ("off", 0, 0), ("read_only", 0, 0), ("write_only", 0, 1)],
+    )
+    async def test_cache_modes(self, mode, hits, size):
+        service = make_service(cache_mode=mode, cache_ttl=60)
+
+        await service.detect_from_text("hello")
+        await service.detect_from_text("hello")
+
+        stats = service.get_cache_stats()
+        assert stats["hits"] == hits
+        assert stats["size"] == size
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_recomputed(self):
+        service = make_service(cache_mode="on", cache_ttl=0)
+
+        await service.detect_from_text("hello")
+        await service.detect_from_text("hello")
+
+        assert service.get_cache_stats()["hits"] == 0
+        assert service.get_cache_stats()["misses"] == 2
+
+    def test_unknown_mode_falls_back_to_on(self):
+        assert make_service(cache_mode="sometimes").cache_mode == "on"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_strand_its_batch(self):
+        service = make_service(cache_mode="off")
+        service.max_batch_size = 3
+        release = asyncio.Event()
+        infer_text_batch = service._infer_text_batch
+
+        async def slow_batch(texts):
+            await release.wait()
+            return await infer_text_batch(texts)
+
+        service._infer_text_batch = slow_batch
+
+        # The third text fills the batch; cancel it while the batch is in flight
+        tasks = [asyncio.create_task(service.detect_from_text(text)) for text in "abc"]
+        await asyncio.sleep(0)
+        tasks[-1].cancel()
+        release.set()
+
+        results = await asyncio.gather(*tasks[:-1])
+        assert all("emotions" in result for result in results)
+        assert tasks[-1].cancelled()
+
+    @pytest.mark.asyncio
+    async def test_response_field_order(self):
+        service = make_service(cache_mode="on")
+
+        for _ in range(2):  # computed, then served from the cache
+            result = await service.detect_from_text("hello")
+            assert list(result)[:3] == ["input_type", "emotions", "dominant_emotion"]
+
+        video = await service.detect_from_video(b"frame")
+        assert list(video)[-3:] == ["face_detected", "status", "message"]
@@ -0,0 +1,105 @@
+"""Unit tests for GestureRecognitionService."""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.gesture_recognition import GestureRecognitionService, TrackingState
+
+ROI = (0.1, 0.1, 0.5, 0.5)
+
+
+class TestGestureRecognitionService:
+    @pytest.fixture
+    def service(self):
+        return GestureRecognitionService(tracking_threshold=0.5)
+
+    @pytest.mark.asyncio
+    async def test_process_frame_no_hand_resets_state(self, service):
+        state = TrackingState(last_roi=ROI, confidence=0.1, frames_since_detect=3)
+
+        result = await service.process_frame(b"frame", state)
+
+        assert result["status"] == "not_implemented"
+        assert state == TrackingState()
+
+    @pytest.mark.asyncio
+    async def test_process_frame_detects_only_when_tracking_is_lost(self, service):
+        service._detect_hand = Mock(return_value=ROI)
+        service._track_landmarks = Mock(return_value=("landmarks", 0.9))
+        state = TrackingState()
+
+        for _ in range(5):
+            await service.process_frame(b"frame", state)
+
+        assert service._detect_hand.call_count == 1
+        assert state.last_roi == ROI
+        assert state.frames_since_detect == 4
+
+        service._track_landmarks.return_value = ("landmarks", 0.2)
+        await service.process_frame(b"frame", state)
+
+        assert service._detect_hand.call_count == 2
+        assert state.frames_since_detect == 0
+
+    @pytest.mark.asyncio
+    async def test_submit_frame_keeps_only_newest(self, service):
+        await service.start_continuous_tracking("session-1")
+        service._tracking_sessions["session-1"]["task"].cancel()
+
+        assert service.submit_frame("session-1", b"old") is True
+        assert service.submit_frame("session-1", b"new") is True
+
+        session = service._tracking_sessions["session-1"]
+        assert session["frames"].qsize() == 1
+        assert session["frames"].get_nowait() == b"new"
+        assert session["dropped_frames"] == 1
+        assert await service.stop_continuous_tracking("session-1") is True
+
+    @pytest.mark.asyncio
+    async def test_submit_frame_unknown_session(self, service):
+        assert service.submit_frame("missing", b"frame") is False
+        assert await service.stop_continuous_tracking("missing") is False
+
+    def test_capture_frames_decodes_only_sampled_frames(self, service):
+        cap = Mock()
+        cap.grab.side_effect = [True] * 10 + [False]
+        cap.get.return_value = 30.0  # source FPS
+        cap.retrieve.return_value = (True, "frame")
+        cv2 = Mock()
+        cv2.VideoCapture.return_value = cap
+        loop = Mock()
+
+        with patch("services.gesture_recognition.cv2", cv2):
+            service._capture_frames("session-1", "clip.mp4", 10, loop, Mock(is_set=lambda: False))
+
+        # Every third frame of a 30 FPS source is decoded for 10 FPS: 0, 3, 6, 9
+        assert cap.grab.call_count == 11
+        assert cap.retrieve.call_count == 4
+        loop.call_soon_threadsafe.assert_called_with(service.submit_frame, "session-1", "frame")
+        cap.set.assert_called_once_with(cv2.CAP_PROP_BUFFERSIZE, 1)
+        cap.release.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_video_source_requires_opencv(self, service):
+        with patch("services.gesture_recognition.CV2_AVAILABLE", False):
+            result = await service.start_continuous_tracking("session-1", video_source=0)
+
+        assert result["tracking_started"] is False
+        assert "session-1" not in service._tracking_sessions
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_consumer_when_capture_failed(self, service):
+        await service.start_continuous_tracking("session-1")
+        session = service._tracking_sessions["session-1"]
+
+        async def failed_capture():
+            raise RuntimeError("source lost")
+
+        session["capture_stop"] = Mock()
+        session["capture_task"] = asyncio.ensure_future(failed_capture())
+
+        with pytest.raises(RuntimeError):
+            await service.stop_continuous_tracking("session-1")
+        assert session["task"].cancelled()
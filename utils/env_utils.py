@@ -4,6 +4,8 @@ Environment variable parsing utilities
 
 import os
 
+_TRUTHY = frozenset({"true", "1", "yes", "on"})
+
 
 def parse_bool_env(key: str, default: bool = False) -> bool:
     """
@@ -19,7 +21,7 @@ def parse_bool_env(key: str, default: bool = False) -> bool:
     value = os.getenv(key)
     if value is None:
         return default
-    return value.lower() in ("true", "1", "yes", "on")
+    return value.strip().lower() in _TRUTHY
 
 
 def parse_int_env(key: str, default: int = 0) -> int:
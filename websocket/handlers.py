@@ -386,13 +386,17 @@ class WebSocketHandler:
                 await self._send_error(websocket, "Invalid or empty message for AI request")
                 return
 
-            # --- Generate AI response ---
-            ai_response = self.message_service.generate_ai_response(
-                message=user_message,
-                context_messages=context_messages,
-                model_type=message_data.data.get("model_type", "ollama"),
-                model_name=message_data.data.get("model_name", "llama2"),
-            )
+            # --- Generate AI response (optionally streamed as chunks) ---
+            ai_kwargs = {
+                "message": user_message,
+                "context_messages": context_messages,
+                "model_type": message_data.data.get("model_type", "ollama"),
+                "model_name": message_data.data.get("model_name", "llama2"),
+            }
+            if message_data.data.get("stream"):
+                ai_response = await self._stream_ai_response(websocket, ai_kwargs)
+            else:
+                ai_response = await self.message_service.generate_ai_response(**ai_kwargs)
 
             # --- Build AI message model ---
             ai_message = Message(
@@ -441,6 +445,16 @@ class WebSocketHandler:
             enhanced_logger.error("AI request failed", connection_id=connection_id, error=str(e))
             await self._send_error(websocket, f"AI request failed: {str(e)}")
 
+    async def _stream_ai_response(self, websocket: WebSocket, ai_kwargs: Dict[str, Any]) -> str:
+        """Forward AI response tokens as ai_response_chunk messages; returns the full text"""
+        parts = []
+        async for token in self.message_service.stream_ai_response(**ai_kwargs):
+            parts.append(token)
+            await manager.send_personal_message(
+                {"type": "ai_response_chunk", "token": token}, websocket
+            )
+        return "".join(parts).strip()
+
     async def _handle_room_join(self, message_data: WebSocketMessage, connection_id: str):
         """Handle room join requests"""
         client_session = self.client_sessions[connection_id]
@@ -745,7 +759,7 @@ class WebSocketHandler:
             context_messages = self.message_service.get_recent_messages(5)
 
             # Generate AI response
-            ai_response = self.message_service.generate_ai_response(
+            ai_response = await self.message_service.generate_ai_response(
                 message=user_message.message, context_messages=context_messages
             )
 